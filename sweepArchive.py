@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+#Compact binary archive of boards and the games played on them, for storing
+#millions of them for benchmarks and regression tests. A file is the magic
+#bytes and a version, then one record after another:
+#	header		numOfRows, numOfCols (uint16), numOfBombs (uint32),
+#			StartRow, StartCol (uint16), flags (uint8), seed (int64)
+#			flags bit 0 says whether there is a seed; without it the seed
+#			field is 0 and means nothing
+#	bombs		bitmap of numOfCells bits, bit i of byte i >> 3 set for a bomb
+#			on tile (i << 3) + bit
+#	trace		varint byte length, then one varint per action as kept in
+#			Board.trace
+#Every record carries its own size, so a reader can skip traces it doesn't
+#want. ArchiveReader maps the file with mmap and decodes a record only when
+#it is reached, so an archive of any size streams in constant memory.
+#
+#	python sweepArchive.py --write games.swa --games 10000
+#	python sweepArchive.py --read games.swa
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+from sweepEngine import Board, Solver
+
+magic = b"SWA2"
+recordHeader = struct.Struct("<HHIHHBq")
+HAS_SEED = 1
+
+
+def encodeVarint(value, out):
+	#Unsigned LEB128: seven bits per byte, low bits first
+	while value >= 0x80:
+		out.append((value & 0x7F) | 0x80)
+		value = value >> 7
+	out.append(value)
+
+
+def decodeVarint(data, offset):
+	#Returns (value, offset just past it)
+	value = 0
+	shift = 0
+	while True:
+		byte = data[offset]
+		offset = offset + 1
+		value = value | ((byte & 0x7F) << shift)
+		if byte < 0x80:
+			return value, offset
+		shift = shift + 7
+
+
+def packBombs(numOfCells, bombs):
+	bitmap = bytearray((numOfCells + 7) >> 3)
+	for index in bombs:
+		bitmap[index >> 3] = bitmap[index >> 3] | (1 << (index & 7))
+	return bitmap
+
+
+def unpackBombs(bitmap):
+	#Tile indexes of the set bits, in order
+	bombs = []
+	for byteIndex in range(len(bitmap)):
+		byte = bitmap[byteIndex]
+		while byte:
+			low = byte & -byte
+			bombs.append((byteIndex << 3) + low.bit_length() - 1)
+			byte = byte ^ low
+	return bombs
+
+
+class ArchiveWriter:
+
+	def __init__(self, path, append=False):
+		self.file = open(path, "ab" if append else "wb")
+		if self.file.tell() == 0:
+			self.file.write(magic)
+		self.numOfRecords = 0
+
+	def write(self, board, trace=()):
+		#Store board's current layout and the actions in trace
+		#Only seeds that fit the header can be stored; anything else would
+		#come back as a different board
+		flags = 0
+		seed = 0
+		if board.seed is not None:
+			if type(board.seed) is not int or not -2**63 <= board.seed < 2**63:
+				raise ValueError("seed %r can't be archived, only ints that fit in 64 signed bits" % (board.seed,))
+			flags = HAS_SEED
+			seed = board.seed
+		try:
+			header = recordHeader.pack(board.numOfRows, board.numOfCols, board.numOfBombs, board.StartRow, board.StartCol, flags, seed)
+		except struct.error:
+			raise ValueError("a %dx%d board with %d bombs is too big to archive" % (board.numOfRows, board.numOfCols, board.numOfBombs))
+		record = bytearray(header)
+		record.extend(packBombs(board.numOfCells, board.isBombList))
+		actions = bytearray()
+		for action in trace:
+			encodeVarint(action, actions)
+		encodeVarint(len(actions), record)
+		record.extend(actions)
+		self.file.write(record)
+		self.numOfRecords = self.numOfRecords + 1
+
+	def close(self):
+		self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+
+class ArchiveRecord:
+	#One board and its game. The bombs and trace are only decoded when asked
+	#for, straight from the mapped file.
+
+	__slots__ = ("data", "numOfRows", "numOfCols", "numOfBombs", "StartRow", "StartCol", "seed", "bombsStart", "traceStart", "end")
+
+	def __init__(self, data, offset):
+		#A record that runs past the end of data, e.g. in a file cut short by
+		#a crash, raises ValueError rather than being read as garbage
+		self.data = data
+		if offset + recordHeader.size > len(data):
+			raise ValueError("truncated record at offset %d" % offset)
+		self.numOfRows, self.numOfCols, self.numOfBombs, self.StartRow, self.StartCol, flags, seed = recordHeader.unpack_from(data, offset)
+		self.seed = seed if flags & HAS_SEED else None
+		self.bombsStart = offset + recordHeader.size
+		bombsEnd = self.bombsStart + ((self.numOfRows*self.numOfCols + 7) >> 3)
+		try:
+			traceLength, self.traceStart = decodeVarint(data, bombsEnd)
+		except IndexError:
+			raise ValueError("truncated record at offset %d" % offset)
+		self.end = self.traceStart + traceLength
+		if self.end > len(data):
+			raise ValueError("truncated record at offset %d" % offset)
+
+	def bombs(self):
+		return unpackBombs(self.data[self.bombsStart:self.bombsStart + ((self.numOfRows*self.numOfCols + 7) >> 3)])
+
+	def trace(self):
+		actions = []
+		data = self.data
+		offset = self.traceStart
+		while offset < self.end:
+			action, offset = decodeVarint(data, offset)
+			actions.append(action)
+		return actions
+
+	def geometry(self):
+		return self.numOfRows, self.numOfCols, self.numOfBombs, self.StartRow, self.StartCol
+
+	def board(self, board=None):
+		#This record's board. An existing board of the same size is restarted
+		#in place, which is much cheaper than building a new one.
+		if board is not None and (board.numOfRows, board.numOfCols, board.numOfBombs, board.StartRow, board.StartCol) == self.geometry():
+			board.restart(bombs=self.bombs())
+			board.seed = self.seed
+			return board
+		return Board(*self.geometry(), seed=self.seed, bombs=self.bombs())
+
+
+class ArchiveReader:
+
+	def __init__(self, path):
+		self.file = open(path, "rb")
+		#mmap can't map an empty file, and anything shorter than the magic
+		#bytes isn't an archive anyway
+		if os.fstat(self.file.fileno()).st_size < len(magic):
+			self.file.close()
+			raise ValueError(path + " is not a board archive")
+		self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+		if self.data[:len(magic)] != magic:
+			self.close()
+			raise ValueError(path + " is not a board archive")
+
+	def __iter__(self):
+		offset = len(magic)
+		size = len(self.data)
+		while offset < size:
+			record = ArchiveRecord(self.data, offset)
+			offset = record.end
+			yield record
+
+	def close(self):
+		self.data.close()
+		self.file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+
+def replay(board, trace):
+	#Play the actions of a trace on a freshly restarted board
+	for action in trace:
+		if action & 1:
+			board.flag(action >> 1)
+		else:
+			board.reveal(action >> 1)
+
+
+def checkRecord(record, board=None):
+	#Replay record's game and return (board, problem), where problem is None
+	#if the record holds together: its seed, if any, rebuilds its bombs, and
+	#its game is over by the end of the trace with no reveal after that.
+	#Flags after the end are fine, the solver flags what it has deduced
+	#even when the same step won the game.
+	problem = None
+	if record.seed is not None:
+		board = record.board(board)
+		board.restart(record.seed)
+		if sorted(board.isBombList) != record.bombs():
+			problem = "seed %d doesn't rebuild the stored bombs" % record.seed
+	board = record.board(board)
+	trace = record.trace()
+	for n in range(len(trace)):
+		if (board.won or board.lost) and trace[n] & 1 == 0:
+			return board, problem or "reveal %d of %d comes after the game is over" % (n + 1, len(trace))
+		replay(board, trace[n:n + 1])
+	if problem is None and not board.won and not board.lost:
+		problem = "game isn't over after the last action"
+	return board, problem
+
+
+def recordGames(path, numOfGames, numOfRows=38, numOfCols=56, numOfBombs=400, StartRow=19, StartCol=28, baseSeed=0):
+	#Play seeded games with the solver and archive each board with its game
+	board = Board(numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed=baseSeed)
+	board.trace = []
+	solver = Solver(board)
+	with ArchiveWriter(path) as writer:
+		for n in range(numOfGames):
+			if n > 0:
+				board.restart(baseSeed + n)
+				solver.reset()
+			while solver.phase != "won" and solver.phase != "lost":
+				solver.step()
+			writer.write(board, board.trace)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Write or read a binary archive of boards and solver games")
+	parser.add_argument("--write", metavar="FILE", help="play seeded games and archive them")
+	parser.add_argument("--read", metavar="FILE", help="replay every game in an archive and check each record holds together")
+	parser.add_argument("--games", type=int, default=1000)
+	parser.add_argument("--rows", type=int, default=38)
+	parser.add_argument("--cols", type=int, default=56)
+	parser.add_argument("--bombs", type=int, default=400)
+	parser.add_argument("--start-row", type=int, default=19)
+	parser.add_argument("--start-col", type=int, default=28)
+	parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+	args = parser.parse_args()
+
+	if args.write:
+		start = time.perf_counter()
+		recordGames(args.write, args.games, args.rows, args.cols, args.bombs, args.start_row, args.start_col, args.seed)
+		print("Archived %d games to %s in %.1f s" % (args.games, args.write, time.perf_counter() - start))
+	if args.read:
+		start = time.perf_counter()
+		numOfGames = 0
+		wins = 0
+		numOfProblems = 0
+		board = None
+		with ArchiveReader(args.read) as reader:
+			for record in reader:
+				board, problem = checkRecord(record, board)
+				if problem is not None:
+					print("Game %d: %s" % (numOfGames, problem))
+					numOfProblems = numOfProblems + 1
+				numOfGames = numOfGames + 1
+				wins = wins + (1 if board.won else 0)
+		print("Replayed %d games from %s (%d won, %d with problems) in %.1f s" % (numOfGames, args.read, wins, numOfProblems, time.perf_counter() - start))
+		if numOfProblems:
+			sys.exit(1)
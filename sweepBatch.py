@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+#Plays many seeded games headlessly across a process pool and reports how
+#the bot did. Game n uses seed baseSeed+n so any run can be repeated.
+#
+#	python sweepBatch.py --games 100000 --processes 8
+#	python sweepBatch.py --games 1000 --no-guess
+#	python sweepBatch.py --games 1000 --archive games.swa
+#	python sweepBatch.py --games 3 --rows 300 --cols 300 --bombs 20000 --start-row 150 --start-col 150 --search-workers 8
+
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import sys
+import time
+
+from sweepEngine import Board, Solver
+from sweepNoGuess import NoGuessPool
+from sweepArchive import ArchiveReader
+
+#Which part of the solver made the last move of a game
+phaseGroups = {
+	"start": "deterministic",
+	"spiral": "deterministic",
+	"linear": "deterministic",
+	"maybes": "maybe",
+	"guess": "guess",
+	"endgame": "endgame",
+}
+
+
+def playGame(job, searchPool=None):
+	#Play one game and return (seed, won, seconds, last phase)
+	#job may end with a list of bombs to play instead of the seed's board
+	#searchPool, if given, is the executor the solver shares searches with
+	numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed = job[:6]
+	bombs = job[6] if len(job) > 6 else None
+	start = time.perf_counter()
+	board = Board(numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed=seed, bombs=bombs)
+	solver = Solver(board, pool=searchPool)
+	lastPhase = solver.phase
+	while solver.phase != "won" and solver.phase != "lost":
+		lastPhase = solver.phase
+		solver.step()
+	return seed, solver.phase == "won", time.perf_counter() - start, phaseGroups[lastPhase]
+
+
+def percentile(values, fraction):
+	#values must already be sorted
+	if not values:
+		return 0.0
+	return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def archiveJobs(path, numOfGames):
+	#Boards streamed from a sweepArchive file, read as the pool asks for them
+	with ArchiveReader(path) as reader:
+		for record in itertools.islice(reader, numOfGames):
+			yield record.geometry() + (record.seed, record.bombs())
+
+
+def runBatch(numOfGames, numOfRows=38, numOfCols=56, numOfBombs=400, StartRow=19, StartCol=28, baseSeed=0, processes=None, seeds=None, archive=None, searchWorkers=None):
+	#Returns a dict summarising numOfGames games. seeds, if given, replaces
+	#baseSeed+n, e.g. with boards from sweepNoGuess; archive, if given, is a
+	#sweepArchive file whose first numOfGames boards are played instead.
+	#With searchWorkers the games are played one at a time here and each
+	#solver spreads its frontier searches over that many worker processes,
+	#which is for a few huge boards rather than many small ones.
+	if archive is not None:
+		jobs = archiveJobs(archive, numOfGames)
+	else:
+		if seeds is None:
+			seeds = range(baseSeed, baseSeed + numOfGames)
+		jobs = [(numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed) for seed in seeds[:numOfGames]]
+	if searchWorkers is not None:
+		processes = 1
+	if processes is None:
+		processes = multiprocessing.cpu_count()
+
+	start = time.perf_counter()
+	if searchWorkers is not None:
+		with ProcessPoolExecutor(searchWorkers) as searchPool:
+			results = [playGame(job, searchPool) for job in jobs]
+	elif processes == 1:
+		results = [playGame(job) for job in jobs]
+	else:
+		#Big chunks keep the pool's messaging cost small next to the games
+		chunksize = max(1, numOfGames // (processes * 16))
+		with multiprocessing.Pool(processes) as pool:
+			results = list(pool.imap_unordered(playGame, jobs, chunksize))
+	wallTime = time.perf_counter() - start
+	#An archive may hold fewer games than asked for
+	numOfGames = len(results)
+
+	times = sorted(result[2] for result in results)
+	wins = sum(1 for result in results if result[1])
+	endings = {}
+	for seed, won, seconds, group in results:
+		key = group + (" won" if won else " lost")
+		endings[key] = endings.get(key, 0) + 1
+
+	return {
+		"games": numOfGames,
+		"processes": processes,
+		"wins": wins,
+		"winRate": wins / numOfGames if numOfGames else 0.0,
+		"meanTime": sum(times) / numOfGames if numOfGames else 0.0,
+		"p50Time": percentile(times, 0.5),
+		"p90Time": percentile(times, 0.9),
+		"p99Time": percentile(times, 0.99),
+		"wallTime": wallTime,
+		"gamesPerSecond": numOfGames / wallTime if wallTime > 0 else 0.0,
+		"endings": endings,
+	}
+
+
+def printReport(report):
+	print("Games:        %d on %d processes" % (report["games"], report["processes"]))
+	print("Win rate:     %.2f%% (%d won)" % (100 * report["winRate"], report["wins"]))
+	print("Solve time:   mean %.1f ms, p50 %.1f ms, p90 %.1f ms, p99 %.1f ms" % (1000 * report["meanTime"], 1000 * report["p50Time"], 1000 * report["p90Time"], 1000 * report["p99Time"]))
+	print("Throughput:   %.1f games/s (%.1f s wall)" % (report["gamesPerSecond"], report["wallTime"]))
+	print("Game endings:")
+	for key in sorted(report["endings"]):
+		print("  %-20s %d" % (key, report["endings"][key]))
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Play many seeded games with the solver and report the results")
+	parser.add_argument("--games", type=int, default=1000)
+	parser.add_argument("--rows", type=int, default=38)
+	parser.add_argument("--cols", type=int, default=56)
+	parser.add_argument("--bombs", type=int, default=400)
+	parser.add_argument("--start-row", type=int, default=19)
+	parser.add_argument("--start-col", type=int, default=28)
+	parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+	parser.add_argument("--processes", type=int, default=None, help="defaults to the number of cores")
+	parser.add_argument("--no-guess", action="store_true", help="only play boards from the sweepNoGuess pool")
+	parser.add_argument("--archive", metavar="FILE", help="play the boards stored in a sweepArchive file")
+	parser.add_argument("--search-workers", type=int, default=None, help="play one game at a time and search each frontier in this many processes")
+	args = parser.parse_args()
+
+	seeds = None
+	if args.no_guess:
+		noGuessPool = NoGuessPool(args.rows, args.cols, args.bombs, args.start_row, args.start_col)
+		if len(noGuessPool) < args.games:
+			print("The no-guess pool only has %d boards for %s, fill it with sweepNoGuess.py --boards %d" % (len(noGuessPool), noGuessPool.key, args.games))
+			sys.exit(2)
+		seeds = noGuessPool.seeds
+
+	printReport(runBatch(args.games, args.rows, args.cols, args.bombs, args.start_row, args.start_col, args.seed, args.processes, seeds, args.archive, args.search_workers))
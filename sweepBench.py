@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+#Fixed-seed benchmarks of the engine's hot paths on the standard board sizes.
+#Timings are compared with the baselines in sweepBenchBaseline.json and the
+#run fails if any of them got slower than the allowed threshold. Timings only
+#mean something on the machine they were taken on, so the baselines are not
+#kept in git: record them with --save before making a change, then compare.
+#
+#"restart" is Board.restart with each game's seed on one board per size, and
+#"reveal" is every Board.reveal, from the first click, chords and deductions
+#alike. Reveals also count towards the phase that made them, so "total" is
+#restart plus the phases.
+#
+#	python sweepBench.py --save       record baselines on this machine
+#	python sweepBench.py              compare against them
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from sweepEngine import Board, Solver
+
+baselineFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sweepBenchBaseline.json")
+
+#name: (numOfRows, numOfCols, numOfBombs, StartRow, StartCol)
+benchBoards = {
+	"beginner": (9, 9, 10, 5, 5),
+	"intermediate": (16, 16, 40, 8, 8),
+	"expert": (16, 30, 99, 8, 15),
+	"halat": (38, 56, 400, 19, 28),
+}
+
+#Solver phase -> timed hot path
+phaseTimers = {
+	"start": "deterministic",
+	"spiral": "deterministic",
+	"linear": "deterministic",
+	"maybes": "maybe",
+	"guess": "guess",
+	"endgame": "guess",
+}
+
+timerNames = ["restart", "reveal", "deterministic", "maybe", "guess", "total"]
+
+
+def benchBoard(numOfRows, numOfCols, numOfBombs, StartRow, StartCol, numOfGames, baseSeed=0):
+	#Seconds spent in each hot path over numOfGames seeded games
+	timers = dict((name, 0.0) for name in timerNames)
+	wins = 0
+	board = Board(numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed=baseSeed)
+	reveal = board.reveal
+
+	def timedReveal(index):
+		start = time.perf_counter()
+		opened = reveal(index)
+		timers["reveal"] = timers["reveal"] + time.perf_counter() - start
+		return opened
+
+	board.reveal = timedReveal
+	solver = Solver(board)
+	for n in range(numOfGames):
+		start = time.perf_counter()
+		board.restart(baseSeed + n)
+		timers["restart"] = timers["restart"] + time.perf_counter() - start
+		solver.reset()
+		while solver.phase != "won" and solver.phase != "lost":
+			timer = phaseTimers[solver.phase]
+			start = time.perf_counter()
+			solver.step()
+			timers[timer] = timers[timer] + time.perf_counter() - start
+		if solver.phase == "won":
+			wins = wins + 1
+	timers["total"] = sum(timers[name] for name in timerNames if name != "total" and name != "reveal")
+	return timers, wins
+
+
+def runBench(numOfGames=50, repeats=3):
+	#Best of several repeats for every board, in milliseconds per game
+	results = {}
+	for name in benchBoards:
+		best = None
+		for r in range(repeats):
+			timers, wins = benchBoard(*benchBoards[name], numOfGames)
+			if best is None:
+				best = timers
+			else:
+				for timer in timers:
+					best[timer] = min(best[timer], timers[timer])
+		results[name] = dict((timer, 1000 * best[timer] / numOfGames) for timer in timerNames)
+		results[name]["winRate"] = wins / numOfGames
+	return results
+
+
+def compare(results, baselines, threshold, minTime):
+	#List of (board, timer, baseline, now) for every timer slower than
+	#threshold times its baseline. Timers under minTime ms are too noisy.
+	slower = []
+	for name in results:
+		if name not in baselines:
+			continue
+		for timer in timerNames:
+			before = baselines[name].get(timer)
+			now = results[name][timer]
+			if before is None or max(before, now) < minTime:
+				continue
+			if now > before * threshold:
+				slower.append((name, timer, before, now))
+	return slower
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Benchmark the solver's hot paths against stored baselines")
+	parser.add_argument("--games", type=int, default=None, help="games per board size, defaults to the baseline's")
+	parser.add_argument("--repeats", type=int, default=3)
+	parser.add_argument("--threshold", type=float, default=1.5, help="fail when a timer exceeds this multiple of its baseline")
+	parser.add_argument("--min-time", type=float, default=0.05, help="ignore timers under this many ms per game")
+	parser.add_argument("--save", action="store_true", help="store the results as the new baselines")
+	parser.add_argument("--baseline", default=baselineFile)
+	args = parser.parse_args()
+
+	baselines = None
+	if os.path.exists(args.baseline) and not args.save:
+		with open(args.baseline) as f:
+			baselines = json.load(f)
+		#Timings are only comparable over the same seeds
+		if args.games is None:
+			args.games = baselines["games"]
+		elif args.games != baselines["games"]:
+			print("Baselines were recorded over %d games per board, not %d" % (baselines["games"], args.games))
+			sys.exit(2)
+	if args.games is None:
+		args.games = 50
+
+	results = runBench(args.games, args.repeats)
+
+	print("%-14s" % "ms/game" + "".join("%14s" % timer for timer in timerNames) + "%10s" % "won")
+	for name in results:
+		print("%-14s" % name + "".join("%14.3f" % results[name][timer] for timer in timerNames) + "%9.0f%%" % (100 * results[name]["winRate"]))
+
+	if args.save:
+		with open(args.baseline, "w") as f:
+			json.dump({"games": args.games, "boards": results}, f, indent=1, sort_keys=True)
+		print("Saved baselines to " + args.baseline)
+		sys.exit(0)
+
+	if baselines is None:
+		print("No baselines at " + args.baseline + ", run with --save on this machine first")
+		sys.exit(0)
+
+	slower = compare(results, baselines["boards"], args.threshold, args.min_time)
+	for name, timer, before, now in slower:
+		print("SLOWER: %s %s %.3f ms -> %.3f ms (x%.2f)" % (name, timer, before, now, now / before))
+	if slower:
+		sys.exit(1)
+	print("All timers within x%.2f of the baselines" % args.threshold)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+#Draws a Board on a single tkinter Canvas instead of one Button per tile.
+#Hidden tiles are just the canvas background, so only tiles that have been
+#revealed or flagged own canvas items. Changed tiles are collected from the
+#board and redrawn together once per frame.
+
+from tkinter import Canvas
+
+from sweepCells import BOMB, CLICKED, FLAGGED, CLUE_SHIFT
+
+#Font colour for each number of nearby bombs
+numColours = ["#e9e9e9","blue","green","red","#9900ff","#660000","#4a86e8","black","#d9d9d9"]
+
+hiddenColour = "#c8c8c8"
+revealedColour = "#e9e9e9"
+gridColour = "#9a9a9a"
+
+
+class CanvasRenderer:
+
+	def __init__(self, root, board, cellSize=None, maxSize=1000, row=0, column=0, frameTime=16):
+		self.root = root
+		self.board = board
+		self.frameTime = frameTime
+		if cellSize is None:
+			cellSize = max(2, min(24, maxSize // max(board.numOfRows, board.numOfCols)))
+		self.cellSize = cellSize
+		#Numbers and symbols are only readable on reasonably big tiles
+		self.showText = cellSize >= 10
+		self.font = ("Terminal", max(6, cellSize // 2))
+
+		self.canvas = Canvas(root, width=board.numOfCols*cellSize, height=board.numOfRows*cellSize, bg=hiddenColour, highlightthickness=0)
+		self.canvas.grid(row=row, column=column)
+		if cellSize >= 4:
+			for x in range(1, board.numOfCols):
+				self.canvas.create_line(x*cellSize, 0, x*cellSize, board.numOfRows*cellSize, fill=gridColour)
+			for y in range(1, board.numOfRows):
+				self.canvas.create_line(0, y*cellSize, board.numOfCols*cellSize, y*cellSize, fill=gridColour)
+
+		#index -> (rectangle, text) for every tile that isn't plain hidden
+		self.cellItems = {}
+		self.framePending = False
+
+	def cellAt(self, x, y):
+		#Tile index under canvas pixel (x, y), or None
+		col = int(x) // self.cellSize
+		row = int(y) // self.cellSize
+		if 0 <= col < self.board.numOfCols and 0 <= row < self.board.numOfRows:
+			return (row*self.board.numOfCols) + col
+		return None
+
+	def clear(self):
+		self.canvas.delete("cell")
+		self.cellItems = {}
+
+	def setCell(self, index, fill, text="", textColour="black"):
+		size = self.cellSize
+		if index in self.cellItems:
+			rect, label = self.cellItems[index]
+			self.canvas.itemconfigure(rect, fill=fill)
+			if label is not None:
+				self.canvas.itemconfigure(label, text=text, fill=textColour)
+			return
+		x = (index % self.board.numOfCols) * size
+		y = (index // self.board.numOfCols) * size
+		rect = self.canvas.create_rectangle(x, y, x+size, y+size, fill=fill, outline=gridColour if size >= 4 else "", tags="cell")
+		label = None
+		if self.showText:
+			label = self.canvas.create_text(x + size/2, y + size/2, text=text, fill=textColour, font=self.font, tags="cell")
+		self.cellItems[index] = (rect, label)
+
+	def clearCell(self, index):
+		if index in self.cellItems:
+			rect, label = self.cellItems.pop(index)
+			self.canvas.delete(rect)
+			if label is not None:
+				self.canvas.delete(label)
+
+	def drawCell(self, index):
+		self.drawState(index, self.board.cellState[index])
+
+	def drawState(self, index, state):
+		#Draw tile index as if its cellState byte were state. Used directly
+		#when the board belongs to another thread and only snapshots arrive.
+		if state & FLAGGED:
+			self.setCell(index, hiddenColour if self.showText else "red", "🚩", "red")
+		elif state & CLICKED:
+			if state & BOMB:
+				self.setCell(index, "red", "💣", "black")
+			else:
+				clue = state >> CLUE_SHIFT
+				self.setCell(index, revealedColour, str(clue) if clue > 0 else "", numColours[clue])
+		else:
+			self.clearCell(index)
+
+	def flush(self):
+		#Redraw every tile the board changed since the last flush
+		board = self.board
+		changed = board.takeChanged()
+		if len(changed) >= board.numOfCells:
+			#A new board touches everything; start from an empty canvas and
+			#only draw what isn't hidden
+			self.clear()
+			changed = [index for index in range(board.numOfCells) if not board.isUnknown(index)]
+		else:
+			changed = set(changed)
+		for index in changed:
+			self.drawCell(index)
+
+	def requestFrame(self):
+		#Flush on the next frame; any number of requests before then are
+		#batched into one redraw
+		if not self.framePending:
+			self.framePending = True
+			self.root.after(self.frameTime, self.frame)
+
+	def frame(self):
+		self.framePending = False
+		self.flush()
+
+	def markStart(self):
+		self.setCell(self.board.StartIndex, hiddenColour, "S", "black")
+
+	def showAllBombs(self):
+		board = self.board
+		self.showBombs([index for index in board.isBombList if board.isUnknown(index)])
+
+	def showBombs(self, indexes):
+		for index in indexes:
+			self.setCell(index, "black" if not self.showText else hiddenColour, "💣", "black")
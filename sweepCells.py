@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+#Bits of Board.cellState, one byte per tile. The top four bits hold the clue
+#of a revealed tile; a hidden tile has no clue yet, so there they hold the
+#hypothesis bits used while the solver tries out "what if" layouts.
+
+BOMB = 1
+CLICKED = 2
+FLAGGED = 4
+VISITED = 8 #queued by a reveal cascade
+MAYBE_BOMB = 16
+MAYBE_CLEAR = 32
+CLUE_SHIFT = 4
@@ -0,0 +1,598 @@
+# -*- coding: utf-8 -*-
+
+#Headless minesweeper engine. Board owns all of the game state in compact
+#arrays and Solver runs the spiral/maybe/guess bot on top of it. Nothing in here
+#touches tkinter, so it can be used without a display; the GUI scripts only
+#render whatever cells the board reports as changed.
+
+import random
+import math
+import time
+from collections import deque
+from array import array
+
+from sweepCells import BOMB, CLICKED, FLAGGED, VISITED, MAYBE_BOMB, MAYBE_CLEAR, CLUE_SHIFT
+from sweepStats import newStats, writeRecord
+from sweepFrontier import frontierComponents, frontierLinear, frontierPropagate, frontierDeduce, frontierProbabilities, endgameProbabilities
+
+
+def spiralOrder(X, Y):
+	#List of (x, y, index) visited by the spiral walk, starting in the middle
+	order = []
+	x = y = 0
+	dx = 0
+	dy = -1
+	for i in range(max(X, Y)**2):
+		if (-X/2 < x <= X/2) and (-Y/2 < y <= Y/2):
+			xtemp = math.ceil(x+X/2)-1
+			ytemp = math.ceil(y+Y/2)-1
+			order.append((xtemp, ytemp, (ytemp*X) + xtemp))
+		if x == y or (x < 0 and x == -y) or (x > 0 and x == 1-y):
+			dx, dy = -dy, dx
+		x, y = x+dx, y+dy
+	return order
+
+
+def neighbourTable(numOfRows, numOfCols):
+	#Flat CSR style table of every tile's neighbours. The neighbours of tile i
+	#are neighbourList[neighbourStart[i]:neighbourStart[i+1]] and
+	#numOfNearbyTiles[i] is how many there are (3, 5 or 8)
+	neighbourStart = array('i', [0]) * (numOfRows*numOfCols + 1)
+	neighbourList = array('i')
+	numOfNearbyTiles = array('b', [0]) * (numOfRows*numOfCols)
+	index = 0
+	for y in range(numOfRows):
+		for x in range(numOfCols):
+			for b in range(max(y-1, 0), min(y+2, numOfRows)):
+				for a in range(max(x-1, 0), min(x+2, numOfCols)):
+					if a!=x or b!=y:
+						neighbourList.append((b*numOfCols) + a)
+			neighbourStart[index+1] = len(neighbourList)
+			numOfNearbyTiles[index] = neighbourStart[index+1] - neighbourStart[index]
+			index = index + 1
+	return neighbourStart, neighbourList, numOfNearbyTiles
+
+
+#Geometry only depends on the board size, so every Board and Solver of the
+#same size shares one copy. Nothing may modify these arrays.
+neighbourTables = {}
+spiralRanks = {}
+
+
+def cachedNeighbourTable(numOfRows, numOfCols):
+	key = (numOfRows, numOfCols)
+	if key not in neighbourTables:
+		neighbourTables[key] = neighbourTable(numOfRows, numOfCols)
+	return neighbourTables[key]
+
+
+def cachedSpiralRank(numOfRows, numOfCols):
+	#spiralRank[index] is where tile index comes in spiral order
+	key = (numOfRows, numOfCols)
+	if key not in spiralRanks:
+		spiralRank = array('i', [0]) * (numOfRows*numOfCols)
+		rank = 0
+		for xtemp, ytemp, indextemp in spiralOrder(numOfCols, numOfRows):
+			spiralRank[indextemp] = rank
+			rank = rank + 1
+		spiralRanks[key] = spiralRank
+	return spiralRanks[key]
+
+
+def sampleBombs(rng, numOfCells, numOfBombs, excluded):
+	#Floyd's algorithm: numOfBombs distinct tiles that aren't in excluded, in
+	#time proportional to numOfBombs rather than to the size of the board.
+	#Tiles are picked by their rank among the allowed tiles and then shifted
+	#past the excluded ones.
+	excluded = sorted(excluded)
+	numOfChoices = numOfCells - len(excluded)
+	if not 0 <= numOfBombs <= numOfChoices:
+		raise ValueError("numOfBombs must be between 0 and %d" % numOfChoices)
+	chosen = set()
+	for j in range(numOfChoices - numOfBombs, numOfChoices):
+		t = rng.randrange(j + 1)
+		chosen.add(j if t in chosen else t)
+	bombs = []
+	for t in sorted(chosen):
+		for e in excluded:
+			if e <= t:
+				t = t + 1
+			else:
+				break
+		bombs.append(t)
+	return bombs
+
+
+class Board:
+
+	def __init__(self, numOfRows=38, numOfCols=56, numOfBombs=400, StartRow=19, StartCol=28, seed=None, bombs=None):
+		self.numOfRows = numOfRows
+		self.numOfCols = numOfCols
+		self.numOfBombs = numOfBombs
+		self.StartRow = StartRow
+		self.StartCol = StartCol
+		self.StartIndex = ((StartRow-1)*numOfCols) + StartCol -1
+		self.numOfCells = numOfRows*numOfCols
+		self.neighbourStart, self.neighbourList, self.numOfNearbyTiles = cachedNeighbourTable(numOfRows, numOfCols)
+		self.seed = seed
+		self.rng = random.Random(seed)
+
+		#One byte of state per tile, see sweepCells, and the number of bombs
+		#next to each tile. These are allocated once; restart only clears the
+		#tiles the last game touched.
+		self.cellState = bytearray(self.numOfCells)
+		self.nearbyBombList = array('b', bytes(self.numOfCells))
+
+		#Running counts of flagged and unknown (not clicked, not flagged)
+		#tiles around each tile, kept up to date by flag and reveal
+		self.nearbyFlagList = array('b', bytes(self.numOfCells))
+		self.nearbyUnknownList = array('b', self.numOfNearbyTiles)
+
+		self.isBombList = []
+		#Every tile revealed or flagged since the last restart
+		self.touchedCells = []
+		#(index, old state) for every hypothesis written by suppose, see
+		#checkpoint and rollback
+		self.journal = []
+		#Set to a list to record every reveal and flag as (index << 1) | 1 for
+		#a flag or index << 1 for a reveal; chords show up as their reveals.
+		#Replaying it on the same board replays the game, see sweepArchive.
+		self.trace = None
+		self.restart(seed, bombs)
+		#Every tile needs drawing the first time
+		self.changedCells = list(range(self.numOfCells))
+
+	def restart(self, seed=None, bombs=None):
+		#New board. Given a seed it is the same board Board(..., seed=seed)
+		#would make, e.g. one from sweepNoGuess; given bombs, a list of tile
+		#indexes, it is exactly that layout, e.g. one from sweepArchive.
+		#Without a seed the board can't be rebuilt from one, so seed is None.
+		self.seed = seed
+		if seed is not None:
+			self.rng.seed(seed)
+		cellState = self.cellState
+		nearbyBombList = self.nearbyBombList
+		nearbyFlagList = self.nearbyFlagList
+		nearbyUnknownList = self.nearbyUnknownList
+		numOfNearbyTiles = self.numOfNearbyTiles
+		neighbourStart = self.neighbourStart
+		neighbourList = self.neighbourList
+
+		#Undo the last game. Only its bombs and the tiles it revealed or
+		#flagged, plus the tiles around those and any hypotheses left
+		#standing, can differ from a fresh board, so the cost is in proportion
+		#to the game rather than the board.
+		self.rollback()
+		changed = self.isBombList + self.touchedCells
+		for index in self.isBombList:
+			cellState[index] = 0
+			for k in range(neighbourStart[index], neighbourStart[index+1]):
+				nearbyBombList[neighbourList[k]] = 0
+		for index in self.touchedCells:
+			cellState[index] = 0
+			for k in range(neighbourStart[index], neighbourStart[index+1]):
+				near = neighbourList[k]
+				nearbyFlagList[near] = 0
+				nearbyUnknownList[near] = numOfNearbyTiles[near]
+		self.touchedCells = []
+
+		#Bombs go anywhere except the start tile and the tiles around it.
+		#Bombs and the number of bombs next to each tile are worked out once
+		#here, so reveals, chords and showing the bombs never have to search
+		#isBombList
+		if bombs is not None:
+			self.isBombList = list(bombs)
+		else:
+			excluded = [self.StartIndex]
+			excluded.extend(self.neighbours(self.StartIndex))
+			self.isBombList = sampleBombs(self.rng, self.numOfCells, self.numOfBombs, excluded)
+		for index in self.isBombList:
+			cellState[index] = BOMB
+			for k in range(neighbourStart[index], neighbourStart[index+1]):
+				near = neighbourList[k]
+				nearbyBombList[near] = nearbyBombList[near] + 1
+
+		self.numOfClickedTiles = 0
+		self.numOfFlaggedTiles = 0
+		if self.trace is not None:
+			self.trace = []
+
+		self.lost = False
+		self.won = False
+
+		#Clicked tiles whose surroundings changed since the solver last looked
+		#at them. A tile goes in here when it is revealed or when one of its
+		#neighbours is revealed or flagged.
+		self.dirtyCells = set()
+
+		#Redraw whatever the last game showed
+		self.changedCells = changed
+
+	def takeChanged(self):
+		#Hand the renderer the tiles touched since the last call
+		changed = self.changedCells
+		self.changedCells = []
+		return changed
+
+	def numOfUnknownTiles(self):
+		return self.numOfCells - self.numOfClickedTiles - self.numOfFlaggedTiles
+
+	def bombCheck(self, index):
+		return self.cellState[index] & BOMB
+
+	def isClicked(self, index):
+		return self.cellState[index] & CLICKED != 0
+
+	def isFlagged(self, index):
+		return self.cellState[index] & FLAGGED != 0
+
+	def isUnknown(self, index):
+		return self.cellState[index] & (CLICKED | FLAGGED) == 0
+
+	def clue(self, index):
+		#Number on a revealed tile, -1 while it is hidden
+		state = self.cellState[index]
+		if state & CLICKED:
+			return state >> CLUE_SHIFT
+		return -1
+
+	def checkpoint(self):
+		#Mark to roll back to. Hypotheses nest: suppose more, then roll back
+		#to an earlier mark to undo everything after it.
+		return len(self.journal)
+
+	def suppose(self, index, bomb):
+		#Mark a hidden tile as a bomb or clear "what if" without touching the
+		#real game. The hypothesis lives in the MAYBE bits of cellState, so
+		#reading a tile's state reads the hypothesis too, and its old state is
+		#journalled so rollback only has to undo the tiles actually supposed.
+		#Roll back before the next reveal or flag.
+		state = self.cellState[index]
+		self.journal.append((index, state))
+		self.cellState[index] = (state & ~(MAYBE_BOMB | MAYBE_CLEAR)) | (MAYBE_BOMB if bomb else MAYBE_CLEAR)
+
+	def rollback(self, mark=0):
+		#Undo every hypothesis made since checkpoint() returned mark, newest
+		#first
+		cellState = self.cellState
+		journal = self.journal
+		while len(journal) > mark:
+			index, state = journal.pop()
+			cellState[index] = state
+
+	def flag(self, index):
+		cellState = self.cellState
+		if cellState[index] & CLICKED == 0:
+			if self.trace is not None:
+				self.trace.append((index << 1) | 1)
+			if cellState[index] & FLAGGED == 0:
+				cellState[index] = cellState[index] | FLAGGED
+				change = 1
+			else:
+				cellState[index] = cellState[index] & ~FLAGGED
+				change = -1
+			self.numOfFlaggedTiles = self.numOfFlaggedTiles + change
+			nearbyFlagList = self.nearbyFlagList
+			nearbyUnknownList = self.nearbyUnknownList
+			nearby = self.neighbours(index)
+			for near in nearby:
+				nearbyFlagList[near] = nearbyFlagList[near] + change
+				nearbyUnknownList[near] = nearbyUnknownList[near] - change
+			self.changedCells.append(index)
+			self.touchedCells.append(index)
+			self.dirtyCells.update(nearby)
+
+	def neighbours(self, index):
+		return self.neighbourList[self.neighbourStart[index]:self.neighbourStart[index+1]]
+
+	def chord(self, index):
+		#If a clicked tile has as many flags around it as its number, reveal
+		#every other tile around it. Returns the list of tiles that were opened.
+		cellState = self.cellState
+		opened = []
+
+		if cellState[index] & (CLICKED | BOMB) == CLICKED and self.nearbyUnknownList[index]>0:
+			#Check if all nearby bombs have been flagged
+			if self.nearbyFlagList[index]==cellState[index] >> CLUE_SHIFT:
+				#reveal all non-flagged nearby tiles
+				for near in self.neighbours(index):
+					if cellState[near] & FLAGGED == 0:
+						opened.extend(self.reveal(near))
+
+		return opened
+
+	def reveal(self, index):
+		#Open a tile and, if it has no bombs around it, cascade out through the
+		#empty region with a worklist instead of recursing. The VISITED bit
+		#marks tiles that have already been queued so each one is handled once,
+		#which keeps the cost linear in the number of tiles opened.
+		#Returns the list of tiles that were newly opened.
+		neighbourStart = self.neighbourStart
+		neighbourList = self.neighbourList
+		cellState = self.cellState
+		nearbyBombList = self.nearbyBombList
+		dirtyCells = self.dirtyCells
+		nearbyFlagList = self.nearbyFlagList
+		nearbyUnknownList = self.nearbyUnknownList
+		opened = []
+
+		if cellState[index] & CLICKED:
+			return opened
+		if self.trace is not None:
+			self.trace.append(index << 1)
+
+		if cellState[index] & BOMB:
+			for near in self.neighbours(index):
+				if cellState[index] & FLAGGED:
+					nearbyFlagList[near] = nearbyFlagList[near] - 1
+				else:
+					nearbyUnknownList[near] = nearbyUnknownList[near] - 1
+			if cellState[index] & FLAGGED:
+				self.numOfFlaggedTiles = self.numOfFlaggedTiles - 1
+			cellState[index] = BOMB | CLICKED
+			opened.append(index)
+			self.changedCells.append(index)
+			self.touchedCells.append(index)
+			self.lost = True
+			return opened
+
+		cellState[index] = cellState[index] | VISITED
+		queue = deque([index])
+		while queue:
+			index = queue.popleft()
+			state = cellState[index]
+			if state & CLICKED:
+				continue
+			nearbyBombCount = nearbyBombList[index]
+			#A flag that gets cascaded over stops counting as a flag, and the
+			#clue replaces any hypothesis bits
+			wasFlagged = state & FLAGGED
+			if wasFlagged:
+				self.numOfFlaggedTiles = self.numOfFlaggedTiles - 1
+			cellState[index] = (nearbyBombCount << CLUE_SHIFT) | CLICKED | VISITED
+			opened.append(index)
+			dirtyCells.add(index)
+
+			for k in range(neighbourStart[index], neighbourStart[index+1]):
+				near = neighbourList[k]
+				dirtyCells.add(near)
+				if wasFlagged:
+					nearbyFlagList[near] = nearbyFlagList[near] - 1
+				else:
+					nearbyUnknownList[near] = nearbyUnknownList[near] - 1
+				if nearbyBombCount==0 and cellState[near] & VISITED == 0:
+					cellState[near] = cellState[near] | VISITED
+					queue.append(near)
+
+		self.changedCells.extend(opened)
+		self.touchedCells.extend(opened)
+		self.numOfClickedTiles = self.numOfClickedTiles + len(opened)
+		#Check to see if you've won
+		if self.numOfClickedTiles == self.numOfCells-self.numOfBombs:
+			self.won = True
+		return opened
+
+
+class Solver:
+
+	def __init__(self, board, maxNodes=200000, guessTime=0.05, infoTieBreak=True, endgameThreshold=30, pool=None, parallelSize=100, patterns=None, propagate=False):
+		self.board = board
+		#Once this few hidden tiles are left, solve them all exactly using the
+		#total bomb count instead of reasoning about the frontier alone
+		self.endgameThreshold = endgameThreshold
+		#Search budget for each question asked of a frontier component
+		self.maxNodes = maxNodes
+		#Seconds a guess may spend counting layouts before estimating
+		self.guessTime = guessTime
+		#Between equally safe guesses prefer the one with the fewest unknown
+		#tiles around it, since its number is the most likely to settle them
+		self.infoTieBreak = infoTieBreak
+		#Remaining ties go to the tile that comes first in spiral order
+		self.spiralRank = cachedSpiralRank(board.numOfRows, board.numOfCols)
+		#Optional concurrent.futures executor, owned by the caller, that
+		#frontier searches are shared with in jobs of about parallelSize
+		#unknowns. A frontier unknown takes around 12 us to search and a job
+		#about 220 us to go to a worker and back, so a job of 100 spends
+		#most of its time searching.
+		self.pool = pool
+		self.parallelSize = parallelSize
+		#Optional sweepPatterns.PatternCache of components solved before, e.g.
+		#sweepPatterns.sharedPatterns to remember them across games
+		self.patterns = patterns
+		#Try sweepFrontier.frontierPropagate before searching. It finds the
+		#same deductions but is about twice as slow as the search on boards
+		#of the sizes the scripts use.
+		self.propagate = propagate
+		self.reset()
+
+	def reset(self):
+		#phase is one of "start", "spiral", "linear", "maybes", "guess",
+		#"endgame", "won", "lost"
+		self.phase = "start"
+		self.stats = newStats()
+
+	def step(self):
+		#Run one pass of the current phase and work out which phase comes next
+		board = self.board
+		stats = self.stats
+		phase = self.phase
+		start = time.perf_counter()
+
+		if phase == "start":
+			stats["revealedByFlood"] = stats["revealedByFlood"] + len(board.reveal(board.StartIndex))
+			phase = "spiral"
+		elif phase == "spiral":
+			#spiral runs until nothing is left to deduce, so a second pass
+			#would never find anything new
+			self.spiral()
+			phase = "linear"
+		elif phase == "linear":
+			if self.frontierLinear() > 0:
+				phase = "spiral"
+			elif board.numOfUnknownTiles() <= self.endgameThreshold:
+				phase = "endgame"
+			else:
+				phase = "maybes"
+		elif phase == "endgame":
+			self.endgame()
+			phase = "spiral"
+		elif phase == "maybes":
+			if self.frontierMaybes() > 0:
+				phase = "spiral"
+			else:
+				phase = "guess"
+		elif phase == "guess":
+			self.probabilityGuess()
+			phase = "spiral"
+
+		phaseTime = stats["phaseTime"]
+		phaseTime[self.phase] = phaseTime.get(self.phase, 0.0) + time.perf_counter() - start
+
+		if board.lost:
+			phase = "lost"
+		elif board.won:
+			phase = "won"
+		self.phase = phase
+		if phase == "lost" or phase == "won":
+			self.writeStats()
+		return phase
+
+	def writeStats(self):
+		#One JSON-lines record per finished game, if a sink is open
+		board = self.board
+		record = {
+			"rows": board.numOfRows,
+			"cols": board.numOfCols,
+			"bombs": board.numOfBombs,
+			"seed": board.seed,
+			"result": self.phase,
+		}
+		record.update(self.stats)
+		writeRecord(record)
+
+	def solve(self):
+		#Play the current board to the end without any pacing
+		while self.phase != "won" and self.phase != "lost":
+			self.step()
+		return self.phase
+
+	def spiral(self):
+		#Deterministic pass over the frontier. Only tiles in board.dirtyCells
+		#are examined, and chording or flagging puts their neighbours back in,
+		#so this keeps going until the board stops changing. The work done is
+		#proportional to the number of tiles that changed, not the board size.
+		#Returns the number of tiles flagged or revealed.
+		board = self.board
+		neighbourStart = board.neighbourStart
+		neighbourList = board.neighbourList
+		nearbyFlagList = board.nearbyFlagList
+		nearbyUnknownList = board.nearbyUnknownList
+		cellState = board.cellState
+		dirtyCells = board.dirtyCells
+		FlagClick = board.flag
+		chordCount = 0
+		flagCount = 0
+		examined = 0
+
+		while dirtyCells:
+			indextemp = dirtyCells.pop()
+			examined = examined + 1
+
+			if cellState[indextemp] & (CLICKED | BOMB) == CLICKED and nearbyUnknownList[indextemp]>0:
+				clue = cellState[indextemp] >> CLUE_SHIFT
+
+				#All nearby bombs found, so chord
+				if nearbyFlagList[indextemp]==clue:
+					chordCount = chordCount + len(board.chord(indextemp))
+
+				#Unknowns left are exactly the bombs left, so flag them all
+				elif nearbyUnknownList[indextemp]==clue-nearbyFlagList[indextemp]:
+					for k in range(neighbourStart[indextemp], neighbourStart[indextemp+1]):
+						near = neighbourList[k]
+						if cellState[near] & (CLICKED | FLAGGED) == 0:
+							flagCount = flagCount + 1
+							FlagClick(near)
+
+		stats = self.stats
+		stats["spiralPasses"] = stats["spiralPasses"] + 1
+		stats["cellsExamined"] = stats["cellsExamined"] + examined
+		stats["revealedByChord"] = stats["revealedByChord"] + chordCount
+		stats["flags"] = stats["flags"] + flagCount
+		updateCount = chordCount + flagCount
+		if updateCount == 0:
+			stats["idleSpiralPasses"] = stats["idleSpiralPasses"] + 1
+		return updateCount
+
+	def probabilityGuess(self):
+		#Click the hidden tile least likely to be a bomb, see
+		#sweepFrontier.frontierProbabilities. Returns the tile clicked.
+		board = self.board
+		probabilities, interior, interiorProbability = frontierProbabilities(board, self.maxNodes, self.guessTime, stats=self.stats, patterns=self.patterns)
+		candidates = list(probabilities.items())
+		candidates.extend((index, interiorProbability) for index in interior)
+		return self.clickSafest(candidates)
+
+	def clickSafest(self, candidates):
+		#Reveal the (tile, probability) candidate least likely to be a bomb
+		board = self.board
+		if not candidates:
+			return None
+
+		nearbyUnknownList = board.nearbyUnknownList
+		spiralRank = self.spiralRank
+		if self.infoTieBreak:
+			key = lambda item: (round(item[1], 9), nearbyUnknownList[item[0]], spiralRank[item[0]])
+		else:
+			key = lambda item: (round(item[1], 9), spiralRank[item[0]])
+		index = min(candidates, key=key)[0]
+		stats = self.stats
+		stats["guesses"] = stats["guesses"] + 1
+		stats["revealedByFlood"] = stats["revealedByFlood"] + len(board.reveal(index))
+		return index
+
+	def applyDeductions(self, safe, bombs):
+		#Flag every proven bomb and reveal every proven clear tile. Returns the
+		#number of tiles changed.
+		board = self.board
+		stats = self.stats
+		for index in bombs:
+			if not board.isFlagged(index):
+				board.flag(index)
+				stats["flags"] = stats["flags"] + 1
+		for index in safe:
+			stats["revealedByFlood"] = stats["revealedByFlood"] + len(board.reveal(index))
+		return len(safe) + len(bombs)
+
+	def endgame(self):
+		#Exact probabilities over every hidden tile, see sweepFrontier. Acts on
+		#anything certain, otherwise makes the best guess. Returns the number
+		#of tiles changed.
+		self.stats["endgamePasses"] = self.stats["endgamePasses"] + 1
+		probabilities = endgameProbabilities(self.board)
+		if probabilities is None:
+			#Too many hidden tiles or no consistent layout; guess as normal
+			self.probabilityGuess()
+			return 1
+		safe = [index for index in probabilities if probabilities[index] == 0]
+		bombs = [index for index in probabilities if probabilities[index] == 1]
+		if safe or bombs:
+			return self.applyDeductions(safe, bombs)
+		self.clickSafest(list(probabilities.items()))
+		return 1
+
+	def frontierLinear(self):
+		#Subset rules and elimination over the frontier, see sweepFrontier
+		self.stats["linearPasses"] = self.stats["linearPasses"] + 1
+		safe, bombs = frontierLinear(self.board)
+		return self.applyDeductions(safe, bombs)
+
+	def frontierMaybes(self):
+		#Exact deductions from search, see sweepFrontier, after "what if"
+		#chains if propagate is on
+		components = frontierComponents(self.board)
+		if self.propagate:
+			safe, bombs = frontierPropagate(self.board, components, self.stats)
+			if safe or bombs:
+				return self.applyDeductions(safe, bombs)
+		safe, bombs = frontierDeduce(self.board, self.maxNodes, components, self.stats, self.pool, self.parallelSize, self.patterns)
+		return self.applyDeductions(safe, bombs)
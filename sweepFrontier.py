@@ -0,0 +1,764 @@
+# -*- coding: utf-8 -*-
+
+#Exact reasoning over the frontier. Every revealed tile with hidden tiles
+#around it gives a constraint "these hidden tiles hold exactly this many
+#bombs". The frontier splits into components that share no hidden tiles, and
+#each component is reasoned about on its own: first with cheap linear rules
+#and then, if those find nothing, by backtracking search with pruning.
+
+from math import gcd, comb
+from collections import deque
+import time
+
+from sweepCells import BOMB, CLICKED, FLAGGED, MAYBE_BOMB, MAYBE_CLEAR, CLUE_SHIFT
+
+
+def frontierComponents(board):
+	#Returns a list of components. Each component is (unknowns, constraints)
+	#where unknowns is a list of tile indexes in search order and constraints
+	#is a list of (tiles, bombsLeft) pairs
+	cellState = board.cellState
+	nearbyFlagList = board.nearbyFlagList
+	nearbyUnknownList = board.nearbyUnknownList
+
+	#Constraints from every clue that still has unknown tiles around it
+	constraints = []
+	tileConstraints = {}
+	for index in range(board.numOfCells):
+		if cellState[index] & (CLICKED | BOMB) == CLICKED and nearbyUnknownList[index]>0:
+			tiles = [near for near in board.neighbours(index) if cellState[near] & (CLICKED | FLAGGED) == 0]
+			for near in tiles:
+				if near in tileConstraints:
+					tileConstraints[near].append(len(constraints))
+				else:
+					tileConstraints[near] = [len(constraints)]
+			constraints.append((tiles, (cellState[index] >> CLUE_SHIFT)-nearbyFlagList[index]))
+
+	return splitComponents(constraints, tileConstraints)
+
+
+def splitComponents(constraints, tileConstraints):
+	#Components of constraints, a list of (tiles, bombsLeft), where
+	#tileConstraints maps each tile to the positions of the constraints it is
+	#in. Walks tile -> constraint -> tile; the walk order is also a good
+	#search order since constraints close quickly along it
+	components = []
+	seenTile = set()
+	seenConstraint = [False] * len(constraints)
+	for start in tileConstraints:
+		if start in seenTile:
+			continue
+		seenTile.add(start)
+		unknowns = [start]
+		componentConstraints = []
+		k = 0
+		while k < len(unknowns):
+			for c in tileConstraints[unknowns[k]]:
+				if not seenConstraint[c]:
+					seenConstraint[c] = True
+					componentConstraints.append(constraints[c])
+					for near in constraints[c][0]:
+						if near not in seenTile:
+							seenTile.add(near)
+							unknowns.append(near)
+			k = k + 1
+		components.append((unknowns, componentConstraints))
+
+	return components
+
+
+def subsetDeduce(constraints):
+	#Pairwise rules between overlapping clues, e.g. the 1-1 and 1-2 patterns.
+	#For clues A and B, the tiles only in B hold at least bombsLeft(B) minus
+	#bombsLeft(A) bombs. When that is every tile only in B, those are all
+	#bombs and the tiles only in A are all clear.
+	safe = set()
+	bombs = set()
+	tileConstraints = {}
+	for c in range(len(constraints)):
+		for near in constraints[c][0]:
+			if near in tileConstraints:
+				tileConstraints[near].append(c)
+			else:
+				tileConstraints[near] = [c]
+
+	for a in range(len(constraints)):
+		tilesA, bombsA = constraints[a]
+		setA = set(tilesA)
+		others = set()
+		for near in tilesA:
+			others.update(tileConstraints[near])
+		for b in others:
+			if b == a:
+				continue
+			tilesB, bombsB = constraints[b]
+			onlyB = [near for near in tilesB if near not in setA]
+			if len(onlyB) == 0:
+				continue
+			onlyA = len(tilesA) - (len(tilesB) - len(onlyB))
+			if bombsB - bombsA == len(onlyB):
+				bombs.update(onlyB)
+				safe.update(near for near in tilesA if near not in tilesB)
+			elif onlyA == 0 and bombsB == bombsA:
+				#A is inside B and already accounts for all of B's bombs
+				safe.update(onlyB)
+
+	return list(safe), list(bombs)
+
+
+def eliminationDeduce(unknowns, constraints):
+	#Gaussian elimination over the component's clue equations using integer
+	#row operations. Each reduced row is sum(coef*tile) = total with every tile
+	#0 or 1, so if total is as big (or as small) as the row can possibly make
+	#it, every tile in the row is decided.
+	position = {}
+	for i in range(len(unknowns)):
+		position[unknowns[i]] = i
+	rows = []
+	for tiles, bombsLeft in constraints:
+		row = {}
+		for near in tiles:
+			row[position[near]] = 1
+		rows.append((row, bombsLeft))
+
+	pivot = 0
+	for col in range(len(unknowns)):
+		for r in range(pivot, len(rows)):
+			if col in rows[r][0]:
+				break
+		else:
+			continue
+		rows[pivot], rows[r] = rows[r], rows[pivot]
+		pivotRow, pivotTotal = rows[pivot]
+		pivotCoef = pivotRow[col]
+		for r in range(len(rows)):
+			row, total = rows[r]
+			if r == pivot or col not in row:
+				continue
+			coef = row[col]
+			newRow = {}
+			for k in row:
+				newRow[k] = row[k] * pivotCoef
+			for k in pivotRow:
+				value = newRow.get(k, 0) - pivotRow[k] * coef
+				if value == 0:
+					newRow.pop(k, None)
+				else:
+					newRow[k] = value
+			newTotal = total * pivotCoef - pivotTotal * coef
+			#Keep the numbers small
+			divisor = abs(newTotal)
+			for k in newRow:
+				divisor = gcd(divisor, newRow[k])
+			if divisor > 1:
+				for k in newRow:
+					newRow[k] = newRow[k] // divisor
+				newTotal = newTotal // divisor
+			rows[r] = (newRow, newTotal)
+		pivot = pivot + 1
+		if pivot == len(rows):
+			break
+
+	safe = []
+	bombs = []
+	for row, total in rows:
+		if not row:
+			continue
+		most = sum(coef for coef in row.values() if coef > 0)
+		least = sum(coef for coef in row.values() if coef < 0)
+		if total == most:
+			for k in row:
+				if row[k] > 0:
+					bombs.append(unknowns[k])
+				else:
+					safe.append(unknowns[k])
+		elif total == least:
+			for k in row:
+				if row[k] < 0:
+					bombs.append(unknowns[k])
+				else:
+					safe.append(unknowns[k])
+
+	return safe, bombs
+
+
+def frontierLinear(board, components=None):
+	#Polynomial time tier run before any search: subset rules first, then
+	#elimination on the components where those found nothing
+	if components is None:
+		components = frontierComponents(board)
+	safe = []
+	bombs = []
+	for unknowns, constraints in components:
+		componentSafe, componentBombs = subsetDeduce(constraints)
+		if not componentSafe and not componentBombs:
+			componentSafe, componentBombs = eliminationDeduce(unknowns, constraints)
+		safe.extend(componentSafe)
+		bombs.extend(componentBombs)
+	return safe, bombs
+
+
+def contradicts(board, index, bomb):
+	#Suppose tile index is a bomb (or clear) and follow the single clue
+	#rules from there on the board's what-if layer: a clue with all its bombs
+	#makes the rest clear, a clue that needs all its open tiles makes them
+	#bombs. Returns True if some clue ends up with too many or too few bombs,
+	#which proves the opposite. Everything supposed is rolled back.
+	cellState = board.cellState
+	nearbyFlagList = board.nearbyFlagList
+	mark = board.checkpoint()
+	board.suppose(index, bomb)
+	queue = deque([index])
+	contradiction = False
+	while queue and not contradiction:
+		for clueIndex in board.neighbours(queue.popleft()):
+			if cellState[clueIndex] & (CLICKED | BOMB) != CLICKED:
+				continue
+			clue = cellState[clueIndex] >> CLUE_SHIFT
+			bombs = nearbyFlagList[clueIndex]
+			open_ = []
+			for near in board.neighbours(clueIndex):
+				state = cellState[near]
+				if state & (CLICKED | FLAGGED) == 0:
+					if state & MAYBE_BOMB:
+						bombs = bombs + 1
+					elif state & MAYBE_CLEAR == 0:
+						open_.append(near)
+			if bombs > clue or bombs + len(open_) < clue:
+				contradiction = True
+				break
+			if open_ and (bombs == clue or bombs + len(open_) == clue):
+				for near in open_:
+					board.suppose(near, bombs < clue)
+					queue.append(near)
+	board.rollback(mark)
+	return contradiction
+
+
+def frontierPropagate(board, components=None, stats=None):
+	#Cheap tier between the linear rules and search: every frontier tile is
+	#supposed a bomb and then clear, see contradicts. Finds the deductions
+	#that follow from a chain of single clues, which is most of them, at a
+	#cost proportional to the tiles each chain touches.
+	if components is None:
+		components = frontierComponents(board)
+	safe = []
+	bombs = []
+	for unknowns, constraints in components:
+		for index in unknowns:
+			if stats is not None:
+				stats["hypotheses"] = stats["hypotheses"] + 1
+			if contradicts(board, index, True):
+				safe.append(index)
+			elif contradicts(board, index, False):
+				bombs.append(index)
+	return safe, bombs
+
+
+class ComponentSearch:
+	#Backtracking search over the bomb layouts of one component. Tiles are
+	#given as positions 0..n-1 into the component's unknowns list.
+
+	def __init__(self, unknowns, constraints, maxNodes=200000):
+		self.numOfUnknowns = len(unknowns)
+		position = {}
+		for i in range(len(unknowns)):
+			position[unknowns[i]] = i
+		self.bombsLeft = [bombsLeft for tiles, bombsLeft in constraints]
+		self.size = [len(tiles) for tiles, bombsLeft in constraints]
+		self.tileConstraints = [[] for i in range(len(unknowns))]
+		for c in range(len(constraints)):
+			for near in constraints[c][0]:
+				self.tileConstraints[position[near]].append(c)
+		self.maxNodes = maxNodes
+		self.nodes = 0
+		#Totals over every search, for the solver's statistics
+		self.questions = 0
+		self.totalNodes = 0
+
+	def findSolution(self, forced=None, forcedValue=0):
+		#Depth first search for any layout, with tile "forced" fixed to
+		#forcedValue. Returns the layout as a list of 0/1, None if there is no
+		#layout, or False if the node budget ran out before an answer
+		numOfUnknowns = self.numOfUnknowns
+		tileConstraints = self.tileConstraints
+		bombsLeft = self.bombsLeft
+		placed = [0] * len(bombsLeft)
+		open_ = list(self.size)
+		layout = [-1] * numOfUnknowns
+
+		def fits(i, value):
+			for c in tileConstraints[i]:
+				if placed[c] + value > bombsLeft[c]:
+					return False
+				if placed[c] + value + open_[c] - 1 < bombsLeft[c]:
+					return False
+			return True
+
+		def assign(i, value):
+			layout[i] = value
+			for c in tileConstraints[i]:
+				placed[c] = placed[c] + value
+				open_[c] = open_[c] - 1
+
+		def unassign(i):
+			value = layout[i]
+			layout[i] = -1
+			for c in tileConstraints[i]:
+				placed[c] = placed[c] - value
+				open_[c] = open_[c] + 1
+
+		if forced is not None:
+			if not fits(forced, forcedValue):
+				return None
+			assign(forced, forcedValue)
+
+		#Iterative search: choice[i] is the next value to try at position i
+		order = [i for i in range(numOfUnknowns) if i != forced]
+		choice = [0] * len(order)
+		depth = 0
+		while True:
+			if depth == len(order):
+				return list(layout)
+			if depth < 0:
+				return None
+			self.nodes = self.nodes + 1
+			if self.nodes > self.maxNodes:
+				return False
+			i = order[depth]
+			if layout[i] != -1:
+				unassign(i)
+			value = choice[depth]
+			while value < 2 and not fits(i, value):
+				value = value + 1
+			if value < 2:
+				assign(i, value)
+				choice[depth] = value + 1
+				depth = depth + 1
+				if depth < len(order):
+					choice[depth] = 0
+			else:
+				choice[depth] = 0
+				depth = depth - 1
+
+	def deduce(self):
+		#Returns (safe, bombs) as positions that are clear in every layout or
+		#a bomb in every layout. Positions whose search ran out of budget are
+		#left out of both, so the answer is always sound.
+		numOfUnknowns = self.numOfUnknowns
+		seen = [[False, False] for i in range(numOfUnknowns)]
+		safe = []
+		bombs = []
+
+		layout = self.findSolution()
+		self.questions = self.questions + 1
+		self.totalNodes = self.totalNodes + self.nodes
+		self.nodes = 0
+		if not layout:
+			return safe, bombs
+		for i in range(numOfUnknowns):
+			seen[i][layout[i]] = True
+
+		for i in range(numOfUnknowns):
+			for value in (0, 1):
+				if seen[i][value]:
+					continue
+				layout = self.findSolution(i, value)
+				self.questions = self.questions + 1
+				self.totalNodes = self.totalNodes + self.nodes
+				if layout is None:
+					if value == 1:
+						safe.append(i)
+					else:
+						bombs.append(i)
+				elif layout is not False:
+					for j in range(numOfUnknowns):
+						seen[j][layout[j]] = True
+				#Every search gets its own budget
+				self.nodes = 0
+
+		return safe, bombs
+
+	def countLayouts(self, deadline=None):
+		#Enumerate every layout, grouped by how many bombs it uses. Returns
+		#(layoutCount, tileCount) where layoutCount[k] is the number of layouts
+		#with k bombs and tileCount[k][i] is how many of those put a bomb on
+		#position i. Returns None if the node budget or deadline runs out.
+		numOfUnknowns = self.numOfUnknowns
+		tileConstraints = self.tileConstraints
+		bombsLeft = self.bombsLeft
+		placed = [0] * len(bombsLeft)
+		open_ = list(self.size)
+		layout = [-1] * numOfUnknowns
+		layoutCount = {}
+		tileCount = {}
+		bombCount = 0
+
+		choice = [0] * (numOfUnknowns + 1)
+		depth = 0
+		while depth >= 0:
+			if depth == numOfUnknowns:
+				if bombCount in layoutCount:
+					layoutCount[bombCount] = layoutCount[bombCount] + 1
+					counts = tileCount[bombCount]
+				else:
+					layoutCount[bombCount] = 1
+					counts = tileCount[bombCount] = [0] * numOfUnknowns
+				for i in range(numOfUnknowns):
+					counts[i] = counts[i] + layout[i]
+				depth = depth - 1
+				continue
+			self.nodes = self.nodes + 1
+			if self.nodes > self.maxNodes:
+				return None
+			if deadline is not None and self.nodes & 1023 == 0 and time.perf_counter() > deadline:
+				return None
+			i = depth
+			if layout[i] != -1:
+				bombCount = bombCount - layout[i]
+				for c in tileConstraints[i]:
+					placed[c] = placed[c] - layout[i]
+					open_[c] = open_[c] + 1
+				layout[i] = -1
+			value = choice[depth]
+			while value < 2:
+				for c in tileConstraints[i]:
+					if placed[c] + value > bombsLeft[c] or placed[c] + value + open_[c] - 1 < bombsLeft[c]:
+						break
+				else:
+					break
+				value = value + 1
+			if value < 2:
+				layout[i] = value
+				bombCount = bombCount + value
+				for c in tileConstraints[i]:
+					placed[c] = placed[c] + value
+					open_[c] = open_[c] - 1
+				choice[depth] = value + 1
+				depth = depth + 1
+				choice[depth] = 0
+			else:
+				choice[depth] = 0
+				depth = depth - 1
+
+		return layoutCount, tileCount
+
+
+def packComponent(unknowns, constraints):
+	#Compact, picklable form of a component for another process: tiles become
+	#their positions in unknowns, so only small ints and tuples are sent
+	position = {}
+	for i in range(len(unknowns)):
+		position[unknowns[i]] = i
+	return len(unknowns), tuple((tuple(position[near] for near in tiles), bombsLeft) for tiles, bombsLeft in constraints)
+
+
+def deducePacked(job):
+	#Runs in a worker process. job is (list of packed components, maxNodes);
+	#returns (safe, bombs, questions, nodes) for each component, with safe
+	#and bombs as positions
+	packed, maxNodes = job
+	results = []
+	for numOfUnknowns, constraints in packed:
+		search = ComponentSearch(range(numOfUnknowns), constraints, maxNodes)
+		safe, bombs = search.deduce()
+		results.append((safe, bombs, search.questions, search.totalNodes))
+	return results
+
+
+def frontierDeduce(board, maxNodes=200000, components=None, stats=None, pool=None, parallelSize=100, patterns=None):
+	#Tiles that are clear in every consistent layout and tiles that are a
+	#bomb in every consistent layout, across the whole frontier. Search work
+	#is added to stats["searchQuestions"] and stats["searchNodes"] if given.
+	#Components share nothing, so if pool (a concurrent.futures executor) is
+	#given they are split, in order, into jobs of about parallelSize unknowns
+	#and all but the first job are searched in it while the first is searched
+	#here. A single component is a few dozen unknowns at most and is searched
+	#in less time than a round trip to another process takes, so shipping
+	#them one at a time would only lose; a frontier of less than two jobs is
+	#all searched here. Components already in patterns (a
+	#sweepPatterns.PatternCache) aren't searched at all.
+	if components is None:
+		components = frontierComponents(board)
+	results = [None] * len(components)
+	keys = [None] * len(components)
+	remembered = [False] * len(components)
+	if patterns is not None:
+		hits = patterns.hits
+		misses = patterns.misses
+		for c in range(len(components)):
+			unknowns, constraints = components[c]
+			keys[c] = patterns.canonical(board.numOfCols, unknowns, constraints)
+			if keys[c] is not None:
+				key, order = keys[c]
+				known = patterns.lookup(key, "deduce")
+				if known is not None:
+					results[c] = ([order[p] for p in known[0]], [order[p] for p in known[1]], 0, 0)
+					remembered[c] = True
+		if stats is not None:
+			stats["patternHits"] = stats["patternHits"] + patterns.hits - hits
+			stats["patternMisses"] = stats["patternMisses"] + patterns.misses - misses
+
+	pending = [c for c in range(len(components)) if results[c] is None]
+	jobs = [pending]
+	if pool is not None and sum(len(components[c][0]) for c in pending) >= 2 * parallelSize:
+		jobs = [[]]
+		jobSize = 0
+		for c in pending:
+			if jobSize >= parallelSize:
+				jobs.append([])
+				jobSize = 0
+			jobs[-1].append(c)
+			jobSize = jobSize + len(components[c][0])
+	futures = []
+	for job in jobs[1:]:
+		futures.append((job, pool.submit(deducePacked, ([packComponent(*components[c]) for c in job], maxNodes))))
+	for c in jobs[0]:
+		unknowns, constraints = components[c]
+		search = ComponentSearch(unknowns, constraints, maxNodes)
+		componentSafe, componentBombs = search.deduce()
+		results[c] = (componentSafe, componentBombs, search.questions, search.totalNodes)
+	for job, future in futures:
+		for c, result in zip(job, future.result()):
+			results[c] = result
+
+	if patterns is not None:
+		for c in range(len(components)):
+			if keys[c] is not None and not remembered[c]:
+				key, order = keys[c]
+				canonicalPosition = [0] * len(order)
+				for p in range(len(order)):
+					canonicalPosition[order[p]] = p
+				patterns.store(key, "deduce", ([canonicalPosition[i] for i in results[c][0]], [canonicalPosition[i] for i in results[c][1]]))
+
+	#Merge in component order so the answer doesn't depend on which
+	#process finished first
+	safe = []
+	bombs = []
+	for c in range(len(components)):
+		unknowns = components[c][0]
+		componentSafe, componentBombs, questions, nodes = results[c]
+		if stats is not None:
+			stats["searchQuestions"] = stats["searchQuestions"] + questions
+			stats["searchNodes"] = stats["searchNodes"] + nodes
+		safe.extend(unknowns[i] for i in componentSafe)
+		bombs.extend(unknowns[i] for i in componentBombs)
+	return safe, bombs
+
+
+def combination(n, k):
+	if k < 0 or k > n:
+		return 0
+	return comb(n, k)
+
+
+def convolve(a, b):
+	#Distribution of the bomb total of two independent parts
+	total = {}
+	for i in a:
+		for j in b:
+			total[i+j] = total.get(i+j, 0) + a[i] * b[j]
+	return total
+
+
+def countComponent(board, unknowns, constraints, maxNodes, deadline, stats=None, patterns=None):
+	#ComponentSearch.countLayouts, through the pattern cache when there is one
+	known = None
+	if patterns is not None:
+		hits = patterns.hits
+		misses = patterns.misses
+		canonical = patterns.canonical(board.numOfCols, unknowns, constraints)
+		if canonical is not None:
+			key, order = canonical
+			known = patterns.lookup(key, "counts")
+		if stats is not None:
+			stats["patternHits"] = stats["patternHits"] + patterns.hits - hits
+			stats["patternMisses"] = stats["patternMisses"] + patterns.misses - misses
+	if known is not None:
+		layoutCount, tileCount = known
+		componentCount = {}
+		for bombs in tileCount:
+			counts = [0] * len(order)
+			for p in range(len(order)):
+				counts[order[p]] = tileCount[bombs][p]
+			componentCount[bombs] = counts
+		return dict(layoutCount), componentCount
+
+	search = ComponentSearch(unknowns, constraints, maxNodes)
+	result = search.countLayouts(deadline)
+	if result is not None and patterns is not None and canonical is not None:
+		layoutCount, tileCount = result
+		patterns.store(key, "counts", (dict(layoutCount), dict((bombs, [tileCount[bombs][order[p]] for p in range(len(order))]) for bombs in tileCount)))
+	return result
+
+
+def frontierProbabilities(board, maxNodes=200000, timeBudget=0.05, components=None, stats=None, patterns=None):
+	#Chance of a bomb on every hidden tile. Each component's layouts are
+	#counted by bomb total; the tiles away from the frontier ("interior") hold
+	#the rest of the bombs, so a combination of totals is weighted by the
+	#number of ways to place the remaining bombs in the interior,
+	#comb(interior, bombsRemaining - frontierBombs).
+	#Components that can't be counted inside the time budget fall back to a
+	#local estimate. Returns (probabilities, interior, interiorProbability)
+	#where probabilities maps frontier tiles to their chance of a bomb.
+	#Layout counts are looked up in and saved to patterns if it is given.
+	deadline = time.perf_counter() + timeBudget
+	if components is None:
+		components = frontierComponents(board)
+
+	bombsRemaining = board.numOfBombs - board.numOfFlaggedTiles
+	probabilities = {}
+	counted = []
+	for unknowns, constraints in components:
+		result = countComponent(board, unknowns, constraints, maxNodes, deadline, stats, patterns)
+		if result is None or not result[0]:
+			#Local estimate: the most bomb-dense clue touching each tile
+			for tiles, bombsLeft in constraints:
+				for near in tiles:
+					probabilities[near] = max(probabilities.get(near, 0.0), bombsLeft / len(tiles))
+			bombsRemaining = bombsRemaining - round(sum(probabilities[near] for near in unknowns))
+		else:
+			counted.append((unknowns, result[0], result[1]))
+
+	frontier = set(probabilities)
+	for unknowns, layoutCount, tileCount in counted:
+		frontier.update(unknowns)
+	cellState = board.cellState
+	interior = [index for index in range(board.numOfCells) if cellState[index] & (CLICKED | FLAGGED) == 0 and index not in frontier]
+	numOfInterior = len(interior)
+
+	def weight(frontierBombs):
+		return combination(numOfInterior, bombsRemaining - frontierBombs)
+
+	for j in range(len(counted)):
+		unknowns, layoutCount, tileCount = counted[j]
+		others = {0: 1}
+		for k in range(len(counted)):
+			if k != j:
+				others = convolve(others, counted[k][1])
+		total = 0
+		tileTotal = [0] * len(unknowns)
+		for bombs in layoutCount:
+			w = 0
+			for otherBombs in others:
+				w = w + others[otherBombs] * weight(bombs + otherBombs)
+			total = total + layoutCount[bombs] * w
+			counts = tileCount[bombs]
+			for i in range(len(unknowns)):
+				tileTotal[i] = tileTotal[i] + counts[i] * w
+		for i in range(len(unknowns)):
+			if total > 0:
+				probabilities[unknowns[i]] = tileTotal[i] / total
+			else:
+				#The global count rules everything out, so ignore it here
+				probabilities[unknowns[i]] = sum(tileCount[b][i] for b in tileCount) / sum(layoutCount.values())
+
+	interiorProbability = 1.0
+	if numOfInterior > 0:
+		frontierTotal = {0: 1}
+		for unknowns, layoutCount, tileCount in counted:
+			frontierTotal = convolve(frontierTotal, layoutCount)
+		total = 0
+		interiorBombs = 0
+		for bombs in frontierTotal:
+			w = frontierTotal[bombs] * weight(bombs)
+			total = total + w
+			interiorBombs = interiorBombs + w * (bombsRemaining - bombs)
+		if total > 0:
+			interiorProbability = interiorBombs / total / numOfInterior
+		else:
+			interiorProbability = min(max(bombsRemaining / numOfInterior, 0.0), 1.0)
+
+	return probabilities, interior, interiorProbability
+
+
+def endgameProbabilities(board, maxUnknowns=64):
+	#Exact chance of a bomb on every hidden tile, interior ones included,
+	#using that exactly numOfBombs minus the flags are left. Each clue is a
+	#bitmask over the hidden tiles; tiles are decided one at a time and a
+	#branch is cut as soon as a clue can no longer be met. Counts are memoised
+	#on (position, bombs left, what each still open clue needs), which also
+	#collapses the interior tiles at the end of the order into a binomial.
+	#Returns a dict of tile -> probability, or None if there are more than
+	#maxUnknowns hidden tiles or no layout fits.
+	cellState = board.cellState
+	unknownCount = board.numOfUnknownTiles()
+	if unknownCount > maxUnknowns:
+		return None
+
+	#Frontier tiles first in component order, interior tiles last
+	unknowns = []
+	seen = set()
+	for componentUnknowns, constraints in frontierComponents(board):
+		for near in componentUnknowns:
+			seen.add(near)
+			unknowns.append(near)
+	for index in range(board.numOfCells):
+		if cellState[index] & (CLICKED | FLAGGED) == 0 and index not in seen:
+			unknowns.append(index)
+	numOfUnknowns = len(unknowns)
+	position = {}
+	for i in range(numOfUnknowns):
+		position[unknowns[i]] = i
+
+	masks = []
+	needs = []
+	for index in range(board.numOfCells):
+		if cellState[index] & (CLICKED | BOMB) == CLICKED and board.nearbyUnknownList[index]>0:
+			mask = 0
+			for near in board.neighbours(index):
+				if near in position:
+					mask = mask | (1 << position[near])
+			masks.append(mask)
+			needs.append((cellState[index] >> CLUE_SHIFT) - board.nearbyFlagList[index])
+
+	#Clues touching each position, and the clues still open after it
+	tileClues = [[c for c in range(len(masks)) if masks[c] >> i & 1] for i in range(numOfUnknowns)]
+	openAfter = []
+	for i in range(numOfUnknowns + 1):
+		openAfter.append(tuple(c for c in range(len(masks)) if masks[c] >> i != 0))
+	tilesAfter = [[bin(masks[c] >> (i+1)).count("1") for c in range(len(masks))] for i in range(numOfUnknowns)]
+
+	memo = {}
+
+	def count(i, bombsLeft, need):
+		#Returns (layouts, bombs on each position from i onwards)
+		if bombsLeft < 0 or bombsLeft > numOfUnknowns - i:
+			return 0, None
+		if i == numOfUnknowns:
+			return 1, []
+		key = (i, bombsLeft, tuple(need[c] for c in openAfter[i]))
+		if key in memo:
+			return memo[key]
+		layouts = 0
+		tileCounts = [0] * (numOfUnknowns - i)
+		for value in (0, 1):
+			fits = True
+			for c in tileClues[i]:
+				left = need[c] - value
+				if left < 0 or left > tilesAfter[i][c]:
+					fits = False
+					break
+			if not fits:
+				continue
+			for c in tileClues[i]:
+				need[c] = need[c] - value
+			subLayouts, subCounts = count(i+1, bombsLeft - value, need)
+			for c in tileClues[i]:
+				need[c] = need[c] + value
+			if subLayouts == 0:
+				continue
+			layouts = layouts + subLayouts
+			tileCounts[0] = tileCounts[0] + subLayouts * value
+			for k in range(len(subCounts)):
+				tileCounts[k+1] = tileCounts[k+1] + subCounts[k]
+		memo[key] = (layouts, tileCounts)
+		return memo[key]
+
+	layouts, tileCounts = count(0, board.numOfBombs - board.numOfFlaggedTiles, list(needs))
+	if layouts == 0:
+		return None
+	probabilities = {}
+	for i in range(numOfUnknowns):
+		probabilities[unknowns[i]] = tileCounts[i] / layouts
+	return probabilities
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+#An effectively unbounded board. Tiles are addressed by (x, y) with any
+#integers instead of the flat index = y*numOfCols + x, and are grouped into
+#square chunks that are only created when something looks at them. Whether
+#a tile is a bomb comes from a seeded hash of its coordinates, so a chunk can
+#always be rebuilt and never needs to be stored up front. Chunks that haven't
+#been used for a while are zlib compressed, which keeps memory bounded by
+#maxLiveChunks plus the compressed size of the explored area.
+#
+#InfiniteSolver plays it with the same tiers as sweepEngine.Solver: the
+#flag/chord rules on a dirty set, then the linear rules and the component
+#search from sweepFrontier, then a guess.
+
+import zlib
+from collections import OrderedDict, deque
+
+from sweepCells import BOMB, CLICKED, FLAGGED, VISITED, CLUE_SHIFT
+from sweepFrontier import splitComponents, subsetDeduce, eliminationDeduce, ComponentSearch
+
+nearbyOffsets = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+hashMask = (1 << 64) - 1
+
+
+def tileHash(seed, x, y):
+	#splitmix64 of the seed and coordinates, as a number in [0, 1)
+	z = (seed * 0x9E3779B97F4A7C15 + (x & 0xFFFFFFFF) * 0xBF58476D1CE4E5B9 + (y & 0xFFFFFFFF) * 0x94D049BB133111EB) & hashMask
+	z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & hashMask
+	z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & hashMask
+	z = z ^ (z >> 31)
+	return z / 18446744073709551616.0
+
+
+class InfiniteBoard:
+
+	def __init__(self, seed=0, density=0.16, chunkSize=32, maxLiveChunks=1024):
+		self.seed = seed
+		self.density = density
+		self.chunkSize = chunkSize
+		self.maxLiveChunks = maxLiveChunks
+		#(cx, cy) -> bytearray of cellState bits, most recently used last
+		self.liveChunks = OrderedDict()
+		#(cx, cy) -> zlib compressed bytearray
+		self.packedChunks = {}
+		self.numOfClickedTiles = 0
+		self.numOfFlaggedTiles = 0
+		self.lost = False
+		#Clicked tiles whose surroundings changed since the solver looked
+		self.dirtyCells = set()
+
+	def makeChunk(self, cx, cy):
+		size = self.chunkSize
+		seed = self.seed
+		density = self.density
+		state = bytearray(size*size)
+		for j in range(size):
+			y = cy*size + j
+			for i in range(size):
+				x = cx*size + i
+				#Nothing around the start tile (0, 0) is a bomb
+				if (x < -1 or x > 1 or y < -1 or y > 1) and tileHash(seed, x, y) < density:
+					state[(j*size) + i] = BOMB
+		return state
+
+	def chunk(self, cx, cy):
+		key = (cx, cy)
+		liveChunks = self.liveChunks
+		if key in liveChunks:
+			liveChunks.move_to_end(key)
+			return liveChunks[key]
+		if key in self.packedChunks:
+			state = bytearray(zlib.decompress(self.packedChunks.pop(key)))
+		else:
+			state = self.makeChunk(cx, cy)
+		liveChunks[key] = state
+		if len(liveChunks) > self.maxLiveChunks:
+			oldKey, oldState = liveChunks.popitem(last=False)
+			self.packedChunks[oldKey] = zlib.compress(bytes(oldState))
+		return state
+
+	def getState(self, x, y):
+		size = self.chunkSize
+		return self.chunk(x // size, y // size)[((y % size)*size) + (x % size)]
+
+	def setState(self, x, y, value):
+		size = self.chunkSize
+		self.chunk(x // size, y // size)[((y % size)*size) + (x % size)] = value
+
+	def neighbours(self, x, y):
+		return [(x+dx, y+dy) for dx, dy in nearbyOffsets]
+
+	def isUnknown(self, x, y):
+		return self.getState(x, y) & (CLICKED | FLAGGED) == 0
+
+	def nearbyCounts(self, x, y):
+		#(flagged, unknown) tiles around (x, y)
+		flagged = 0
+		unknown = 0
+		for dx, dy in nearbyOffsets:
+			state = self.getState(x+dx, y+dy)
+			if state & FLAGGED:
+				flagged = flagged + 1
+			elif state & CLICKED == 0:
+				unknown = unknown + 1
+		return flagged, unknown
+
+	def flag(self, x, y):
+		state = self.getState(x, y)
+		if state & CLICKED == 0 and state & FLAGGED == 0:
+			self.setState(x, y, state | FLAGGED)
+			self.numOfFlaggedTiles = self.numOfFlaggedTiles + 1
+			self.dirtyCells.update(self.neighbours(x, y))
+
+	def reveal(self, x, y):
+		#Worklist cascade as in Board.reveal. Returns the newly opened tiles.
+		opened = []
+		state = self.getState(x, y)
+		if state & CLICKED:
+			return opened
+		if state & BOMB:
+			self.setState(x, y, state | CLICKED)
+			self.lost = True
+			return [(x, y)]
+
+		self.setState(x, y, state | VISITED)
+		queue = deque([(x, y)])
+		while queue:
+			x, y = queue.popleft()
+			state = self.getState(x, y)
+			if state & CLICKED:
+				continue
+			nearbyBombCount = 0
+			for dx, dy in nearbyOffsets:
+				nearbyBombCount = nearbyBombCount + (self.getState(x+dx, y+dy) & BOMB)
+			if state & FLAGGED:
+				self.numOfFlaggedTiles = self.numOfFlaggedTiles - 1
+			self.setState(x, y, (nearbyBombCount << CLUE_SHIFT) | CLICKED | VISITED)
+			opened.append((x, y))
+			self.dirtyCells.add((x, y))
+			for near in self.neighbours(x, y):
+				self.dirtyCells.add(near)
+				if nearbyBombCount == 0:
+					nearState = self.getState(near[0], near[1])
+					if nearState & VISITED == 0:
+						self.setState(near[0], near[1], nearState | VISITED)
+						queue.append(near)
+
+		self.numOfClickedTiles = self.numOfClickedTiles + len(opened)
+		return opened
+
+	def memoryUse(self):
+		#Bytes held in live chunks and in compressed chunks
+		live = len(self.liveChunks) * self.chunkSize * self.chunkSize
+		return live, sum(len(packed) for packed in self.packedChunks.values())
+
+
+class InfiniteSolver:
+
+	def __init__(self, board, maxNodes=20000):
+		self.board = board
+		self.maxNodes = maxNodes
+		#Clicked tiles that still have unknown tiles around them
+		self.frontier = set()
+
+	def deterministic(self, maxChanges=1000):
+		#Flag and chord rules until nothing changes, as Solver.spiral. On an
+		#unbounded board this can run outwards forever, so it also stops once
+		#maxChanges tiles have been opened or flagged.
+		board = self.board
+		dirtyCells = board.dirtyCells
+		frontier = self.frontier
+		changed = 0
+		while dirtyCells and changed < maxChanges:
+			x, y = dirtyCells.pop()
+			state = board.getState(x, y)
+			if state & (CLICKED | BOMB) != CLICKED:
+				continue
+			flagged, unknown = board.nearbyCounts(x, y)
+			if unknown == 0:
+				frontier.discard((x, y))
+				continue
+			frontier.add((x, y))
+			clue = state >> CLUE_SHIFT
+			if flagged == clue:
+				for near in board.neighbours(x, y):
+					if board.getState(near[0], near[1]) & (CLICKED | FLAGGED) == 0:
+						changed = changed + len(board.reveal(near[0], near[1]))
+			elif unknown == clue - flagged:
+				for near in board.neighbours(x, y):
+					if board.getState(near[0], near[1]) & (CLICKED | FLAGGED) == 0:
+						board.flag(near[0], near[1])
+						changed = changed + 1
+		return changed
+
+	def components(self):
+		#Frontier components in the shape sweepFrontier expects
+		board = self.board
+		constraints = []
+		tileConstraints = {}
+		for x, y in list(self.frontier):
+			flagged, unknown = board.nearbyCounts(x, y)
+			if unknown == 0:
+				self.frontier.discard((x, y))
+				continue
+			tiles = [near for near in board.neighbours(x, y) if board.isUnknown(near[0], near[1])]
+			for near in tiles:
+				tileConstraints.setdefault(near, []).append(len(constraints))
+			constraints.append((tiles, (board.getState(x, y) >> CLUE_SHIFT) - flagged))
+		return splitComponents(constraints, tileConstraints)
+
+	def deduce(self, components):
+		#Linear rules first, then search, per component
+		safe = []
+		bombs = []
+		for unknowns, constraints in components:
+			componentSafe, componentBombs = subsetDeduce(constraints)
+			if not componentSafe and not componentBombs:
+				componentSafe, componentBombs = eliminationDeduce(unknowns, constraints)
+			if not componentSafe and not componentBombs:
+				search = ComponentSearch(unknowns, constraints, self.maxNodes)
+				positionSafe, positionBombs = search.deduce()
+				componentSafe = [unknowns[i] for i in positionSafe]
+				componentBombs = [unknowns[i] for i in positionBombs]
+			safe.extend(componentSafe)
+			bombs.extend(componentBombs)
+		return safe, bombs
+
+	def guess(self, components):
+		#There is no total bomb count to weigh against, so use the densest
+		#clue touching each frontier tile as its chance of a bomb, and the
+		#board's density for a tile just outside the frontier
+		board = self.board
+		best = None
+		bestChance = 2.0
+		for unknowns, constraints in components:
+			chance = {}
+			for tiles, bombsLeft in constraints:
+				for near in tiles:
+					chance[near] = max(chance.get(near, 0.0), bombsLeft / len(tiles))
+			for near in unknowns:
+				if chance[near] < bestChance:
+					best = near
+					bestChance = chance[near]
+		if bestChance > board.density:
+			#Tiles under any clue are on the frontier, whichever component
+			#they belong to, so only the others are at the board's density
+			frontierTiles = set()
+			for unknowns, constraints in components:
+				frontierTiles.update(unknowns)
+			for unknowns, constraints in components:
+				for x, y in unknowns:
+					for near in board.neighbours(x, y):
+						if near not in frontierTiles and board.isUnknown(near[0], near[1]):
+							board.reveal(near[0], near[1])
+							return near
+		if best is None:
+			return None
+		board.reveal(best[0], best[1])
+		return best
+
+	def run(self, maxRevealed=100000):
+		#Play outwards from (0, 0) until maxRevealed tiles are open or a bomb
+		#is hit. Returns True if it got there without losing.
+		board = self.board
+		board.reveal(0, 0)
+		while not board.lost and board.numOfClickedTiles < maxRevealed:
+			if self.deterministic() > 0:
+				continue
+			components = self.components()
+			safe, bombs = self.deduce(components)
+			for x, y in bombs:
+				board.flag(x, y)
+			for x, y in safe:
+				board.reveal(x, y)
+			if safe or bombs:
+				continue
+			if self.guess(components) is None:
+				break
+		return not board.lost
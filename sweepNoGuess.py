@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+#Boards the solver can finish from the start tile without ever guessing.
+#Random boards often end in a 50/50, which makes every win rate noisy, so
+#candidate seeds are played with the solver and kept only if it wins without
+#a single guess. That takes a few candidates per board on the dense boards,
+#so the pool is filled across worker processes and saved in sweepNoGuess.json;
+#later runs just read the seeds back. Board(..., seed=s) or board.restart(s)
+#rebuilds a kept board. A seed only stands for the same board as long as the
+#generator in sweepEngine doesn't change, so refill after changing it.
+#
+#	python sweepNoGuess.py --boards 1000 --processes 8
+
+import argparse
+import json
+import multiprocessing
+import os
+
+from sweepEngine import Board, Solver
+
+poolFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sweepNoGuess.json")
+
+
+def geometryKey(numOfRows, numOfCols, numOfBombs, StartRow, StartCol):
+	return "%dx%dx%d@%d,%d" % (numOfRows, numOfCols, numOfBombs, StartRow, StartCol)
+
+
+def checkSeed(job):
+	#Returns (seed, True) if the solver wins seed's board without guessing
+	numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed = job
+	board = Board(numOfRows, numOfCols, numOfBombs, StartRow, StartCol, seed=seed)
+	solver = Solver(board)
+	while solver.phase != "won" and solver.phase != "lost" and solver.phase != "guess" and solver.stats["guesses"] == 0:
+		solver.step()
+	return seed, solver.phase == "won" and solver.stats["guesses"] == 0
+
+
+class NoGuessPool:
+	#Seeds of no-guess boards for one board size, as stored in path
+
+	def __init__(self, numOfRows=38, numOfCols=56, numOfBombs=400, StartRow=19, StartCol=28, path=poolFile):
+		self.geometry = (numOfRows, numOfCols, numOfBombs, StartRow, StartCol)
+		self.key = geometryKey(*self.geometry)
+		self.path = path
+		self.seeds = []
+		#Every seed below this has been checked
+		self.nextSeed = 0
+		if os.path.exists(path):
+			with open(path) as f:
+				entry = json.load(f).get(self.key)
+			if entry is not None:
+				self.seeds = entry["seeds"]
+				self.nextSeed = entry["nextSeed"]
+		#Position of the next seed handed out by take
+		self.taken = 0
+
+	def __len__(self):
+		return len(self.seeds)
+
+	def take(self):
+		#Next seed in the pool, going round again once they have all been used
+		if not self.seeds:
+			raise IndexError("no no-guess boards for " + self.key + ", fill the pool first")
+		seed = self.seeds[self.taken % len(self.seeds)]
+		self.taken = self.taken + 1
+		return seed
+
+	def fill(self, numOfBoards, processes=None):
+		#Check seeds from nextSeed on until the pool holds numOfBoards boards,
+		#then save it. Returns the number of boards added.
+		if processes is None:
+			processes = multiprocessing.cpu_count()
+		added = 0
+		batchSize = max(64, 4 * processes)
+		with multiprocessing.Pool(processes) as pool:
+			while len(self.seeds) < numOfBoards:
+				jobs = [self.geometry + (seed,) for seed in range(self.nextSeed, self.nextSeed + batchSize)]
+				#In seed order, so the pool comes out the same however many
+				#processes filled it
+				for seed, ok in pool.imap(checkSeed, jobs):
+					self.nextSeed = seed + 1
+					if ok:
+						self.seeds.append(seed)
+						added = added + 1
+						if len(self.seeds) >= numOfBoards:
+							break
+				self.save()
+		return added
+
+	def save(self):
+		pools = {}
+		if os.path.exists(self.path):
+			with open(self.path) as f:
+				pools = json.load(f)
+		pools[self.key] = {"seeds": self.seeds, "nextSeed": self.nextSeed}
+		temporary = self.path + ".tmp"
+		with open(temporary, "w") as f:
+			json.dump(pools, f, sort_keys=True)
+		os.replace(temporary, self.path)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Find boards the solver finishes without guessing and save their seeds")
+	parser.add_argument("--boards", type=int, default=1000, help="boards the pool should hold")
+	parser.add_argument("--rows", type=int, default=38)
+	parser.add_argument("--cols", type=int, default=56)
+	parser.add_argument("--bombs", type=int, default=400)
+	parser.add_argument("--start-row", type=int, default=19)
+	parser.add_argument("--start-col", type=int, default=28)
+	parser.add_argument("--processes", type=int, default=None, help="defaults to the number of cores")
+	parser.add_argument("--pool", default=poolFile)
+	args = parser.parse_args()
+
+	noGuessPool = NoGuessPool(args.rows, args.cols, args.bombs, args.start_row, args.start_col, args.pool)
+	added = noGuessPool.fill(args.boards, args.processes)
+	print("%s: %d no-guess boards (%d new, %d seeds checked) in %s" % (noGuessPool.key, len(noGuessPool), added, noGuessPool.nextSeed, args.pool))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+#Memory of frontier components that have already been solved. The same small
+#shapes (a 1-1 along a straight edge, a 1-2-1, ...) come up over and over, in
+#one game and across games, so a component is turned into a key that doesn't
+#depend on where it is on the board or which way round it is, and whatever
+#was worked out for it is kept in a size-bounded LRU table.
+#
+#A key lists the component's hidden tiles as (row, col) shifted to start at
+#(0, 0), plus its constraints written with positions in that list. It is the
+#smallest such key over the 8 rotations and reflections. Results are stored
+#by those canonical positions and mapped back onto the component's tiles.
+
+from collections import OrderedDict
+
+#(row, col) -> (row, col) for every rotation and reflection of the grid
+symmetries = [
+	lambda r, c: (r, c),
+	lambda r, c: (r, -c),
+	lambda r, c: (-r, c),
+	lambda r, c: (-r, -c),
+	lambda r, c: (c, r),
+	lambda r, c: (c, -r),
+	lambda r, c: (-c, r),
+	lambda r, c: (-c, -r),
+]
+
+
+class PatternCache:
+
+	def __init__(self, maxSize=4096, minUnknowns=12, maxUnknowns=64):
+		self.maxSize = maxSize
+		#Smaller components are searched faster than they can be keyed, and
+		#bigger ones rarely repeat
+		self.minUnknowns = minUnknowns
+		self.maxUnknowns = maxUnknowns
+		#key -> {"deduce": (safe, bombs), "counts": (layoutCount, tileCount)}
+		#in canonical positions, most recently used last
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def canonical(self, numOfCols, unknowns, constraints):
+		#Returns (key, order) where order[p] is the component position at
+		#canonical position p, or None if the component isn't worth keeping
+		if not self.minUnknowns <= len(unknowns) <= self.maxUnknowns:
+			return None
+		position = {}
+		cells = []
+		for i in range(len(unknowns)):
+			position[unknowns[i]] = i
+			cells.append(divmod(unknowns[i], numOfCols))
+
+		#Pick the smallest shape first; the constraints only need writing out
+		#for the orientations that tie on it
+		candidates = []
+		for symmetry in symmetries:
+			moved = [symmetry(r, c) for r, c in cells]
+			top = min(r for r, c in moved)
+			left = min(c for r, c in moved)
+			order = sorted(range(len(moved)), key=moved.__getitem__)
+			candidates.append((tuple((moved[i][0] - top, moved[i][1] - left) for i in order), order))
+		shape = min(candidate[0] for candidate in candidates)
+
+		best = None
+		for candidateShape, order in candidates:
+			if candidateShape != shape:
+				continue
+			canonicalPosition = [0] * len(order)
+			for p in range(len(order)):
+				canonicalPosition[order[p]] = p
+			rules = tuple(sorted(set((tuple(sorted(canonicalPosition[position[near]] for near in tiles)), bombsLeft) for tiles, bombsLeft in constraints)))
+			if best is None or rules < best[0][1]:
+				best = ((shape, rules), order)
+		return best
+
+	def lookup(self, key, kind):
+		#The stored result of kind "deduce" or "counts" for key, or None
+		entry = self.entries.get(key)
+		if entry is not None and kind in entry:
+			self.entries.move_to_end(key)
+			self.hits = self.hits + 1
+			return entry[kind]
+		self.misses = self.misses + 1
+		return None
+
+	def store(self, key, kind, result):
+		entry = self.entries.get(key)
+		if entry is None:
+			entry = self.entries[key] = {}
+			if len(self.entries) > self.maxSize:
+				self.entries.popitem(last=False)
+		else:
+			self.entries.move_to_end(key)
+		entry[kind] = result
+
+	def clear(self):
+		self.entries.clear()
+		self.hits = 0
+		self.misses = 0
+
+
+#One cache for every Solver in this process that is given it
+sharedPatterns = PatternCache()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+#Paces the solver inside the tkinter main loop and restarts the board after
+#every game.
+#	"visual"	one solver step every waitTime ms, as the bot always has
+#	"turbo"	as many steps as fit in frameBudget seconds, draw, yield to Tk
+#	"max"	like turbo but only draws when a game ends
+#In turbo and max the bot is limited by the CPU rather than by a delay.
+#
+#SolveScheduler steps the solver inside Tk callbacks, so the window can't
+#respond while a long step runs. ThreadedScheduler runs the same modes in a
+#worker thread that owns the board and posts snapshots of changed tiles to a
+#queue, which the Tk side drains for at most frameBudget seconds per frame.
+
+import time
+import threading
+import queue
+
+scheduleModes = ("visual", "turbo", "max")
+
+
+class SolveScheduler:
+
+	def __init__(self, root, solver, renderer, mode="visual", waitTime=100, frameBudget=0.012):
+		if mode not in scheduleModes:
+			raise ValueError("mode must be one of " + ", ".join(scheduleModes))
+		self.root = root
+		self.solver = solver
+		self.board = solver.board
+		self.renderer = renderer
+		self.mode = mode
+		self.waitTime = waitTime
+		self.frameBudget = frameBudget
+		self.gamesPlayed = 0
+		self.gamesWon = 0
+
+	def start(self, delay=0):
+		self.root.after(delay, self.tick)
+
+	def tick(self):
+		solver = self.solver
+		if self.mode == "visual":
+			phase = solver.step()
+			self.renderer.requestFrame()
+		else:
+			#Keep stepping until the frame's time is used up
+			deadline = time.perf_counter() + self.frameBudget
+			phase = solver.step()
+			while phase != "won" and phase != "lost" and time.perf_counter() < deadline:
+				phase = solver.step()
+			if self.mode == "turbo":
+				self.renderer.flush()
+
+		if phase == "won" or phase == "lost":
+			self.gameOver(phase)
+		elif self.mode == "visual":
+			self.root.after(self.waitTime, self.tick)
+		else:
+			self.root.after(1, self.tick)
+
+	def gameOver(self, phase):
+		self.gamesPlayed = self.gamesPlayed + 1
+		self.renderer.flush()
+		if phase == "won":
+			self.gamesWon = self.gamesWon + 1
+			print("You Win")
+			self.root.after(3*self.waitTime if self.mode == "visual" else 1, self.restart)
+		else:
+			print("You Lose")
+			if self.mode == "visual":
+				self.root.after(2*self.waitTime, self.showAllBombs)
+			else:
+				self.renderer.showAllBombs()
+				self.root.after(1, self.restart)
+
+	def showAllBombs(self):
+		self.renderer.showAllBombs()
+		self.root.after(self.waitTime, self.restart)
+
+	def restart(self):
+		self.board.restart()
+		self.solver.reset()
+		self.renderer.flush()
+		self.root.after(10 if self.mode == "visual" else 1, self.tick)
+
+
+class ThreadedScheduler:
+
+	def __init__(self, root, solver, renderer, mode="visual", waitTime=100, frameBudget=0.012, maxEvents=256, cellsPerEvent=128):
+		if mode not in scheduleModes:
+			raise ValueError("mode must be one of " + ", ".join(scheduleModes))
+		self.root = root
+		self.solver = solver
+		self.board = solver.board
+		self.renderer = renderer
+		self.mode = mode
+		self.waitTime = waitTime
+		self.frameBudget = frameBudget
+		#Snapshots and bomb lists are split into events of at most this many
+		#tiles, so one event can't take much of a frame to draw
+		self.cellsPerEvent = cellsPerEvent
+		self.gamesPlayed = 0
+		self.gamesWon = 0
+		#Bounded, so a solver that outruns the drawing waits for it instead
+		#of piling up snapshots
+		self.events = queue.Queue(maxEvents)
+		self.stopping = threading.Event()
+		self.thread = None
+
+	def start(self, delay=0):
+		self.root.after(delay, self.launch)
+
+	def launch(self):
+		#From here on only the worker thread touches the board
+		self.thread = threading.Thread(target=self.run, daemon=True)
+		self.thread.start()
+		self.root.after(self.renderer.frameTime, self.drain)
+
+	def stop(self):
+		self.stopping.set()
+
+	#Worker thread
+
+	def post(self, event):
+		#Wait for room in the queue, but give up if asked to stop
+		while not self.stopping.is_set():
+			try:
+				self.events.put(event, timeout=0.1)
+				return
+			except queue.Full:
+				pass
+
+	def postChanged(self):
+		#("cells", [(index, state), ...]) for every tile changed since last time
+		board = self.board
+		changed = board.takeChanged()
+		if changed:
+			cellState = board.cellState
+			cells = [(index, cellState[index]) for index in set(changed)]
+			for k in range(0, len(cells), self.cellsPerEvent):
+				self.post(("cells", cells[k:k + self.cellsPerEvent]))
+
+	def run(self):
+		solver = self.solver
+		board = self.board
+		pause = self.waitTime / 1000
+		while not self.stopping.is_set():
+			deadline = time.perf_counter() + self.frameBudget
+			phase = solver.step()
+			if self.mode == "turbo":
+				#Post once per frame's worth of steps, as SolveScheduler draws
+				while phase != "won" and phase != "lost" and time.perf_counter() < deadline:
+					phase = solver.step()
+			if phase == "won" or phase == "lost":
+				self.postChanged()
+				self.post((phase, None))
+				if phase == "lost":
+					bombs = [index for index in board.isBombList if board.isUnknown(index)]
+					for k in range(0, len(bombs), self.cellsPerEvent):
+						self.post(("bombs", bombs[k:k + self.cellsPerEvent]))
+				if self.mode == "visual":
+					self.stopping.wait(3*pause)
+				board.restart()
+				solver.reset()
+				self.postChanged()
+			elif self.mode == "visual":
+				self.postChanged()
+				self.stopping.wait(pause)
+			elif self.mode == "turbo":
+				self.postChanged()
+			#"max" lets changes pile up on the board until the game ends
+
+	#Tk side
+
+	def drain(self):
+		#Draw until the queue is empty or the frame's time is used up, then
+		#let Tk have the rest of the frame; anything left waits for the next
+		renderer = self.renderer
+		deadline = time.perf_counter() + self.frameBudget
+		while time.perf_counter() < deadline:
+			try:
+				kind, payload = self.events.get_nowait()
+			except queue.Empty:
+				break
+			if kind == "cells":
+				for index, state in payload:
+					renderer.drawState(index, state)
+			elif kind == "bombs":
+				renderer.showBombs(payload)
+			else:
+				self.gamesPlayed = self.gamesPlayed + 1
+				if kind == "won":
+					self.gamesWon = self.gamesWon + 1
+					print("You Win")
+				else:
+					print("You Lose")
+		if not self.stopping.is_set():
+			self.root.after(renderer.frameTime, self.drain)
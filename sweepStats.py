@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+#Where finished games are recorded. Each game the Solver plays to the end is
+#written as one JSON object per line. Recording is off until a sink is
+#opened, either with openStatsSink or by setting the SWEEP_STATS environment
+#variable to a file path.
+
+import json
+import os
+
+statsSink = None
+
+
+def openStatsSink(path):
+	#Append records to path from now on
+	global statsSink
+	closeStatsSink()
+	statsSink = open(path, "a")
+
+
+def closeStatsSink():
+	global statsSink
+	if statsSink is not None:
+		statsSink.close()
+		statsSink = None
+
+
+def writeRecord(record):
+	if statsSink is not None:
+		statsSink.write(json.dumps(record, sort_keys=True) + "\n")
+		statsSink.flush()
+
+
+def newStats():
+	#Counters kept by the Solver for one game
+	return {
+		"spiralPasses": 0, #calls to Solver.spiral
+		"idleSpiralPasses": 0, #spiral calls that changed nothing
+		"cellsExamined": 0, #dirty tiles looked at by spiral
+		"linearPasses": 0,
+		"hypotheses": 0, #tiles tried as a bomb and as clear by frontierPropagate
+		"searchQuestions": 0, #"can this tile be a bomb/clear" searches
+		"searchNodes": 0, #backtracking nodes over all searches
+		"patternHits": 0, #components answered from sweepPatterns
+		"patternMisses": 0,
+		"endgamePasses": 0,
+		"guesses": 0,
+		"flags": 0,
+		"revealedByChord": 0,
+		"revealedByFlood": 0, #start, deductions and guesses with their cascades
+		"phaseTime": {}, #seconds spent in each phase
+	}
+
+
+if os.environ.get("SWEEP_STATS"):
+	openStatsSink(os.environ["SWEEP_STATS"])